@@ -1,16 +1,135 @@
 """API for toyrobot
 """
 
-import os
 import json
-from flask import Flask, session, request, jsonify
+import os
+from functools import lru_cache
+from time import perf_counter_ns
+from uuid import uuid4
+from flask import Flask, Response, session, request, g
+from flask.sessions import SecureCookieSessionInterface
 from dotenv import load_dotenv
 from toyrobot.core import ToyRobot, Direction
+from toyrobot.events import EVENTS
+from toyrobot.metrics import METRICS
+from toyrobot.program import compile_script
+from toyrobot.store import open_store
 load_dotenv()
 
 
+class TimedSessionInterface(SecureCookieSessionInterface):
+    """Signed cookie sessions recording the time spent decoding and encoding
+    the session while instrumentation is enabled."""
+
+    @METRICS.timed('api.session_open')
+    def open_session(self, app, request):  # pylint: disable=redefined-outer-name
+        return super().open_session(app, request)
+
+    @METRICS.timed('api.session_save')
+    def save_session(self, app, session, response):  # pylint: disable=redefined-outer-name
+        return super().save_session(app, session, response)
+
+
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY')
+app.session_interface = TimedSessionInterface()
+store = open_store(os.getenv('ROBOT_STORE')) if os.getenv('ROBOT_STORE') else None
+'''Optional server-side state store, robots are kept in the session if None'''
+if os.getenv('TOYROBOT_METRICS'):
+    METRICS.enable()
+
+
+@app.before_request
+def start_timer() -> None:
+    """Note the start of the request while instrumentation is enabled."""
+    if METRICS.enabled:
+        g.start = perf_counter_ns()
+
+
+@app.after_request
+def stop_timer(response):
+    """Record the time taken by the request while instrumentation is enabled,
+    counting error responses as rejected."""
+    if METRICS.enabled and 'start' in g:
+        METRICS.observe(f'api.{request.endpoint}', perf_counter_ns() - g.start,
+                        response.status_code >= 400)
+    return response
+
+
+def robot_id() -> str:
+    """Get the ID of the current robot in the server-side store, from the
+    'robot' parameter or the session, assigning a new ID if there is none.
+
+    Returns:
+        str: ID of the current robot
+    """
+    current = request.args.get('robot') or session.get('robot_id')
+    if current is None:
+        current = session['robot_id'] = uuid4().hex
+    return current
+
+
+@METRICS.timed('api.load')
+def load_robot() -> ToyRobot:
+    """Load the current robot from the state store or session, or from the
+    'state' parameter in the {X}{Y}{DIRECTION} format.
+
+    The store and session hold the robot packed into a single integer, older
+    sessions holding a json state are still accepted. The packed state loaded
+    is kept in g.stored so save_robot can skip unchanged robots.
+
+    Returns:
+        ToyRobot: The current robot, or None if there is no current robot
+    """
+    packed = store.get(robot_id()) if store is not None else None
+    if store is None and isinstance(session.get('robot_state'), int):
+        packed = session['robot_state']
+    if packed is not None:
+        g.stored = packed
+        robot = ToyRobot()
+        robot.unpack(packed)
+        return robot
+    if store is None and 'robot_state' in session:
+        robot_state = session['robot_state']
+        return ToyRobot(robot_state)
+    if 'state' in request.args:
+        input_state = request.args.get('state', str)
+        robot = ToyRobot()
+        robot.place((int(input_state[0]), int(input_state[1])),
+                    Direction[input_state[2:].upper()])
+        return robot
+    return None
+
+
+@METRICS.timed('api.save')
+def save_robot(robot: ToyRobot) -> dict:
+    """Save the robot into the state store, or the session without a store,
+    and publish its state to watchers. Nothing is saved or published when the
+    robot is in the state it was loaded in, such as after a rejected move.
+
+    Args:
+        robot (ToyRobot): The robot to save
+
+    Returns:
+        dict: The robot state for the response body
+    """
+    packed = robot.pack()
+    state = robot.state_dict()
+    if g.get('stored') == packed:
+        return state
+    if store is not None:
+        store.set(robot_id(), packed)
+    else:
+        session['robot_state'] = packed
+    g.stored = packed
+    if EVENTS.subscribers:
+        EVENTS.publish(robot_id(), state)
+    return state
+
+
+def _truthy(value: str) -> bool:
+    """Interpret a query parameter as a boolean flag."""
+    return value.lower() in ('1', 'true', 'yes', 'on')
 
 
 @app.route("/place", methods=['POST'])
@@ -36,9 +155,7 @@ def place():
         direction = Direction.EAST
 
     if robot.place(location, direction):
-        state = robot.dump_state()
-        session['robot_state'] = state
-        return {"message": "Success", "state": json.loads(state)}, 200
+        return {"message": "Success", "state": save_robot(robot)}, 200
     return {"message": "Bad Request"}, 400
 
 @app.route("/move", methods=['POST'])
@@ -48,24 +165,13 @@ def move():
     Returns:
         tuple[str, int]: HTTP Response
     """
-    if 'robot_state' in session:
-        robot = ToyRobot(session['robot_state'])
-    elif 'state' in request.args:
-        input_state = request.args.get('state', str)
-        robot = ToyRobot(json.dumps({
-            'location': {
-                'x': input_state[0],
-                'y': input_state[1],
-            },
-            'direction': input_state[2:]
-        }))
-    else:
+    robot = load_robot()
+    if robot is None:
         return {"message": "Bad Request"}, 400
     status = robot.move()
-    state = robot.dump_state()
-    session['robot_state'] = state
-    return {"message": "Moved", "state": json.loads(state)} \
-    if status else {"message": "Ignored", "state": json.loads(state)}, 200
+    state = save_robot(robot)
+    return {"message": "Moved", "state": state} \
+    if status else {"message": "Ignored", "state": state}, 200
 
 @app.route("/left", methods=['POST'])
 def left():
@@ -74,23 +180,11 @@ def left():
     Returns:
         tuple[str, int]: HTTP Response
     """
-    if 'robot_state' in session:
-        robot = ToyRobot(session['robot_state'])
-    elif 'state' in request.args:
-        input_state = request.args.get('state', str)
-        robot = ToyRobot(json.dumps({
-            'location': {
-                'x': input_state[0],
-                'y': input_state[1],
-            },
-            'direction': input_state[2:]
-        }))
-    else:
+    robot = load_robot()
+    if robot is None:
         return {"message": "Bad Request"}, 400
     robot.left()
-    state = robot.dump_state()
-    session['robot_state'] = state
-    return {"message": "Success", "state": json.loads(state)}, 200
+    return {"message": "Success", "state": save_robot(robot)}, 200
 
 @app.route("/right", methods=['POST'])
 def right():
@@ -99,38 +193,118 @@ def right():
     Returns:
         tuple[str, int]: HTTP Response
     """
-    if 'robot_state' in session:
-        robot = ToyRobot(session['robot_state'])
-    elif 'state' in request.args:
-        input_state = request.args.get('state', str)
-        robot = ToyRobot(json.dumps({
-            'location': {
-                'x': input_state[0],
-                'y': input_state[1],
-            },
-            'direction': input_state[2:]
-        }))
-    else:
+    robot = load_robot()
+    if robot is None:
         return {"message": "Bad Request"}, 400
     robot.right()
-    state = robot.dump_state()
-    session['robot_state'] = state
-    return {"message": "Success", "state": json.loads(state)}, 200
+    return {"message": "Success", "state": save_robot(robot)}, 200
+
+@lru_cache(maxsize=4096)
+def report_body(packed: int) -> bytes:
+    """Serialise the report of a robot state once, later reports of the same
+    state reuse the bytes. The packed state identifies the report, so a
+    command which leaves the state unchanged, such as a move rejected at the
+    edge of the plane, keeps the cached report valid.
+
+    Args:
+        packed (int): Packed robot state
+
+    Returns:
+        bytes: The json report
+    """
+    robot = ToyRobot()
+    robot.unpack(packed)
+    return json.dumps({
+        'location': robot.location,
+        'direction': str(robot.direction),
+        'state': robot.state_dict()}).encode()
+
+
+def current_state() -> int:
+    """Get the packed state of the current robot, without building a robot
+    when the store or session already holds it packed.
+
+    Returns:
+        int: Packed state, or None if there is no current robot
+    """
+    packed = store.get(robot_id()) if store is not None else session.get('robot_state')
+    if isinstance(packed, int):
+        return packed
+    robot = load_robot()
+    return robot.pack() if robot is not None else None
+
 
 @app.route("/report", methods=['GET'])
 def report():
-    """Return a json object of the current robot state information.
+    """Return a json object of the current robot state information. The
+    response carries an ETag of the state, and requests with a matching
+    If-None-Match header get an empty 304 response.
 
     Returns:
         tuple[str, int]: HTTP Response
     """
-    if 'robot_state' in session:
-        robot = ToyRobot(session['robot_state'])
-    else:
+    packed = current_state()
+    if packed is None:
         return {"message": "Bad Request"}, 400
-    state = robot.dump_state()
-    response = {
-        'location': robot.location, 
-        'direction': str(robot.direction), 
-        "state": json.loads(state)}
-    return jsonify(response), 200
+    etag = f'{packed:x}'
+    if etag in request.if_none_match:
+        return '', 304, {'ETag': f'"{etag}"'}
+    return report_body(packed), 200, {'ETag': f'"{etag}"', 'Content-Type': 'application/json'}
+
+@app.route("/commands", methods=['POST'])
+def commands():
+    """Apply a list of commands to the current robot in a single request. The
+    body is either a json list of commands, a json object with a 'commands'
+    list, or a plain text script in the command-line syntax. Set the 'reports'
+    parameter to also return the state at every REPORT command.
+
+    Returns:
+        tuple[str, int]: HTTP Response
+    """
+    body = request.get_json(silent=True)
+    if isinstance(body, dict):
+        body = body.get('commands')
+    script = body if isinstance(body, list) else request.get_data(as_text=True)
+    try:
+        program = compile_script([str(command) for command in script]
+                                 if isinstance(script, list) else script)
+    except ValueError as error:
+        return {"message": str(error)}, 400
+
+    robot = load_robot() or ToyRobot()
+    reports = program.run(robot)
+    if robot.location is None:
+        return {"message": "Bad Request"}, 400
+    response = {"message": "Success", "state": save_robot(robot)}
+    if request.args.get('reports', default=False, type=_truthy):
+        response['reports'] = [{
+            'location': {'x': location[0], 'y': location[1]},
+            'direction': str(direction)
+        } for location, direction in reports]
+    return response, 200
+
+@app.route("/metrics", methods=['GET'])
+def metrics():
+    """Export the instrumentation measurements in the Prometheus text format,
+    enabled by setting the TOYROBOT_METRICS environment variable.
+
+    Returns:
+        tuple[str, int]: HTTP Response
+    """
+    if not METRICS.enabled:
+        return {"message": "Metrics are disabled"}, 404
+    return METRICS.render(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+@app.route("/events", methods=['GET'])
+def events():
+    """Stream the state of every robot changed through the API as
+    Server-Sent Events, at most one batch per time window. A Last-Event-ID
+    header resumes after that batch. Each connection holds a worker, so serve
+    with a threaded or asynchronous worker class.
+
+    Returns:
+        Response: HTTP Response streaming the events
+    """
+    cursor = request.headers.get('Last-Event-ID', type=int)
+    return Response(EVENTS.subscribe(cursor), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,298 @@
+"""Asynchronous ASGI API for toyrobot, serve with any ASGI server such as
+'uvicorn asgi:app'.
+
+Exposes the same routes as app.py. Robots are identified by the 'robot'
+parameter or the 'robot_id' cookie and kept in a server-side state store.
+Commands to the same robot are serialised by a per-robot lock while commands
+to different robots run concurrently.
+
+The '/stream' WebSocket route keeps one robot resident for the whole
+connection. Each text message holds one or more commands in the command-line
+syntax and is answered with the new state and the state at every REPORT.
+"""
+
+import asyncio
+import json
+import os
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+from uuid import uuid4
+from weakref import WeakValueDictionary
+from toyrobot.core import ToyRobot, Direction
+from toyrobot.program import compile_script
+from toyrobot.store import StateStore, MemoryStore, open_store
+
+
+class RobotApp():
+    """ASGI application serving the toy robot routes.
+
+    Attributes:
+        store (StateStore): Server-side store holding every robot
+        ROUTES (dict[tuple[str, str], str]):
+            Name of the handler method for each method and path
+
+    Args:
+        store (StateStore): Optional store, an in-process store by default
+    """
+    ROUTES = {
+        ('POST', '/place'): 'place',
+        ('POST', '/move'): 'move',
+        ('POST', '/left'): 'left',
+        ('POST', '/right'): 'right',
+        ('GET', '/report'): 'report',
+    }
+
+    def __init__(self, store: StateStore = None) -> None:
+        """Initialise the application.
+
+        Args:
+            store (StateStore):
+                Optional store, an in-process store is used if not given
+        """
+        self.store = store if store is not None else MemoryStore()
+        self._locks = WeakValueDictionary()
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        """Handle a single ASGI connection.
+
+        Args:
+            scope (dict): ASGI connection scope
+            receive (Callable): ASGI receive channel
+            send (Callable): ASGI send channel
+        """
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'websocket':
+            await self.stream(scope, receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        handler = self.ROUTES.get((scope['method'], scope['path']))
+        if handler is None:
+            await self.respond(send, 404, {"message": "Not Found"})
+            return
+        query, robot_id, new_id = self.identify(scope)
+
+        async with self.lock(robot_id):
+            robot = await self.load(robot_id)
+            status, body = getattr(self, handler)(robot, query)
+            if status == 200 and handler != 'report':
+                await self.call(self.store.set, robot_id, robot.pack())
+        await self.respond(send, status, body, robot_id if new_id else None)
+
+    async def stream(self, scope: dict, receive, send) -> None:
+        """Handle a WebSocket connection controlling a single resident robot.
+
+        The robot stays in memory for the whole connection. Each message runs
+        under the lock of the robot, and the robot is reloaded first if the
+        stored state is no longer the one this connection last wrote, so
+        commands sent to the same robot over HTTP are never overwritten.
+
+        Args:
+            scope (dict): ASGI connection scope
+            receive (Callable): ASGI receive channel
+            send (Callable): ASGI send channel
+        """
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        if scope['path'] != '/stream':
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        _, robot_id, new_id = self.identify(scope)
+        headers = [(b'set-cookie', f'robot_id={robot_id}; Path=/; HttpOnly'.encode())] \
+            if new_id else []
+        await send({'type': 'websocket.accept', 'headers': headers})
+        robot, written = ToyRobot(), None
+
+        while True:
+            message = await receive()
+            if message['type'] != 'websocket.receive':
+                return
+            text = message.get('text')
+            if text is None:
+                text = (message.get('bytes') or b'').decode()
+            async with self.lock(robot_id):
+                stored = await self.call(self.store.get, robot_id)
+                if stored != written:
+                    robot, written = ToyRobot(), stored
+                    if stored is not None:
+                        robot.unpack(stored)
+                try:
+                    reports = compile_script(text).run(robot)
+                except ValueError as error:
+                    body = {"message": str(error)}
+                else:
+                    if robot.location is not None:
+                        written = robot.pack()
+                        await self.call(self.store.set, robot_id, written)
+                    body = {
+                        "message": "Success",
+                        "state": None if robot.location is None else robot.state_dict(),
+                        "reports": [{
+                            'location': {'x': location[0], 'y': location[1]},
+                            'direction': str(direction)
+                        } for location, direction in reports]}
+            await send({'type': 'websocket.send', 'text': json.dumps(body)})
+
+    @staticmethod
+    def identify(scope: dict) -> tuple:
+        """Find the robot a connection is for, from the 'robot' parameter or
+        the 'robot_id' cookie, assigning a new ID if there is none.
+
+        Args:
+            scope (dict): ASGI connection scope
+
+        Returns:
+            tuple[dict, str, bool]:
+                The query parameters, the robot ID and if the ID is new.
+        """
+        query = {key: values[-1] for key, values in
+                 parse_qs(scope['query_string'].decode()).items()}
+        cookies = SimpleCookie()
+        for name, value in scope['headers']:
+            if name == b'cookie':
+                cookies.load(value.decode('latin-1'))
+        robot_id = query.get('robot') or \
+            (cookies['robot_id'].value if 'robot_id' in cookies else None)
+        if robot_id is None:
+            return query, uuid4().hex, True
+        return query, robot_id, False
+
+    async def load(self, robot_id: str) -> ToyRobot:
+        """Load a robot from the store, unplaced if it is not stored.
+
+        Args:
+            robot_id (str): ID of the robot
+
+        Returns:
+            ToyRobot: The robot
+        """
+        packed = await self.call(self.store.get, robot_id)
+        robot = ToyRobot()
+        if packed is not None:
+            robot.unpack(packed)
+        return robot
+
+    @staticmethod
+    async def lifespan(receive, send) -> None:
+        """Acknowledge ASGI lifespan startup and shutdown events.
+
+        Args:
+            receive (Callable): ASGI receive channel
+            send (Callable): ASGI send channel
+        """
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def lock(self, robot_id: str) -> asyncio.Lock:
+        """Get the lock serialising commands to a robot, which lives for as
+        long as a command holds it.
+
+        Args:
+            robot_id (str): ID of the robot
+
+        Returns:
+            asyncio.Lock: The lock of the robot
+        """
+        lock = self._locks.get(robot_id)
+        if lock is None:
+            lock = self._locks[robot_id] = asyncio.Lock()
+        return lock
+
+    async def call(self, function, *args):
+        """Call a store method, on a worker thread unless the store is held
+        in-process, so a slow store does not block other robots.
+
+        Args:
+            function (Callable): The store method
+            *args: Arguments of the store method
+
+        Returns:
+            object: Result of the store method
+        """
+        if isinstance(self.store, MemoryStore):
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    @staticmethod
+    async def respond(send, status: int, body: dict, robot_id: str = None) -> None:
+        """Send a json response, setting the robot cookie for new robots.
+
+        Args:
+            send (Callable): ASGI send channel
+            status (int): HTTP status code
+            body (dict): Response body
+            robot_id (str): ID of a newly created robot, if any
+        """
+        content = json.dumps(body).encode()
+        headers = [(b'content-type', b'application/json'),
+                   (b'content-length', str(len(content)).encode())]
+        if robot_id is not None:
+            headers.append((b'set-cookie', f'robot_id={robot_id}; Path=/; HttpOnly'.encode()))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': content})
+
+    @staticmethod
+    def place(robot: ToyRobot, query: dict) -> tuple:
+        """Place the robot using the 'x', 'y' and 'direction' parameters.
+
+        Args:
+            robot (ToyRobot): The current robot
+            query (dict[str, str]): Query parameters
+
+        Returns:
+            tuple[int, dict]: HTTP status and response body
+        """
+        try:
+            location = (int(query['x']), int(query['y']))
+        except (KeyError, ValueError):
+            return 400, {"message": "Location Parameters invalid"}
+        direction = Direction.__members__.get(query.get('direction', '').upper(),
+                                              Direction.EAST)
+        if robot.place(location, direction):
+            return 200, {"message": "Success", "state": robot.state_dict()}
+        return 400, {"message": "Bad Request"}
+
+    @staticmethod
+    def move(robot: ToyRobot, _query: dict) -> tuple:
+        """Move the current robot forward one increment."""
+        if robot.location is None:
+            return 400, {"message": "Bad Request"}
+        message = "Moved" if robot.move() else "Ignored"
+        return 200, {"message": message, "state": robot.state_dict()}
+
+    @staticmethod
+    def left(robot: ToyRobot, _query: dict) -> tuple:
+        """Rotate the current robot to the left."""
+        if robot.location is None:
+            return 400, {"message": "Bad Request"}
+        robot.left()
+        return 200, {"message": "Success", "state": robot.state_dict()}
+
+    @staticmethod
+    def right(robot: ToyRobot, _query: dict) -> tuple:
+        """Rotate the current robot to the right."""
+        if robot.location is None:
+            return 400, {"message": "Bad Request"}
+        robot.right()
+        return 200, {"message": "Success", "state": robot.state_dict()}
+
+    @staticmethod
+    def report(robot: ToyRobot, _query: dict) -> tuple:
+        """Report the current robot state information."""
+        if robot.location is None:
+            return 400, {"message": "Bad Request"}
+        return 200, {
+            'location': robot.location,
+            'direction': str(robot.direction),
+            "state": robot.state_dict()}
+
+
+app = RobotApp(open_store(os.getenv('ROBOT_STORE')) if os.getenv('ROBOT_STORE') else None)
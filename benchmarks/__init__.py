@@ -0,0 +1,4 @@
+"""Benchmark suite for the toy robot demonstration.
+
+Run with 'python -m benchmarks', see 'python -m benchmarks --help'.
+"""
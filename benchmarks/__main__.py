@@ -0,0 +1,81 @@
+"""Command-line entry point running the benchmark suite and comparing it with
+a stored baseline.
+"""
+
+import argparse
+import json
+import os
+import sys
+from benchmarks.suite import STARTUP, available, compare, measure, robot_memory, startup
+from toyrobot.core import Board
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+'''Default path of the stored baseline results'''
+
+
+def main() -> int:
+    """Run the benchmark suite.
+
+    Returns:
+        int: Exit status, 1 if any benchmark regressed against the baseline
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Toy robot benchmark suite')
+    parser.add_argument('--steps', type=int, default=10 ** 5,
+                        help='robot steps per benchmark, from 10^3 to 10^8 (default 10^5)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the workloads')
+    parser.add_argument('--only', nargs='*', metavar='NAME', help='benchmarks to run')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline results file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed fractional drop in throughput (default 0.25)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--startup', action='store_true',
+                        help='time importing each entry point instead')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure the bytes held by each live robot instead')
+    options = parser.parse_args()
+
+    if options.memory:
+        print(f"{'board':<12} {'robots':>8} {'slots B':>8} {'dict B':>8}")
+        for width in (5, 1000):
+            result = robot_memory(board=Board.empty(width, width))
+            print(f"{f'{width}x{width}':<12} {result['robots']:>8} "
+                  f"{result['slots']:>8.1f} {result['dict']:>8.1f}")
+        return 0
+
+    if options.startup:
+        print(f"{'module':<20} {'import ms':>10} {'process ms':>11}  heavy imports")
+        for module in STARTUP:
+            result = startup(module)
+            print(f"{module:<20} {result['seconds'] * 1000:>10.1f} "
+                  f"{result['process'] * 1000:>11.1f}  {' '.join(result['heavy'])}")
+        return 0
+
+    results = []
+    print(f"{'benchmark':<20} {'steps':>10} {'steps/s':>12} {'p50 ns':>9} "
+          f"{'p90 ns':>9} {'p99 ns':>9} {'peak KiB':>9}")
+    for name in available():
+        if options.only and name not in options.only:
+            continue
+        result = measure(name, options.steps, options.seed)
+        results.append(result)
+        print(f"{name:<20} {result['steps']:>10} {result['throughput']:>12.0f} "
+              f"{result['p50']:>9.0f} {result['p90']:>9.0f} {result['p99']:>9.0f} "
+              f"{result['peak_memory'] / 1024:>9.1f}")
+
+    if options.update_baseline:
+        with open(options.baseline, 'w', encoding='utf-8') as file:
+            json.dump({result['name']: result for result in results}, file, indent=4)
+        return 0
+    if not os.path.exists(options.baseline):
+        return 0
+    with open(options.baseline, encoding='utf-8') as file:
+        regressions = compare(results, json.load(file), options.tolerance)
+    for name, ratio in regressions:
+        print(f'SLOWER: {name} runs at {ratio:.0%} of the baseline throughput')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Open-loop load test of the web API.
+
+Requests are scheduled at a fixed rate regardless of how quickly the server
+answers, and are handed to a pool of simulated clients. Each client keeps its
+own cookie jar, and therefore its own robot, and a keep-alive connection.
+Latency is measured from the time a request was scheduled, so time spent
+waiting for a free client counts against the server as it would for real
+users.
+
+Run with 'python -m benchmarks.load --serve' to start the web API in this
+process, or point --url at a running server, see
+'python -m benchmarks.load --help'.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from http.client import HTTPConnection, HTTPException
+from http.cookies import SimpleCookie
+from queue import Queue
+from urllib.parse import urlsplit
+
+ROUTES = {
+    ('POST', '/move'): 50,
+    ('POST', '/left'): 15,
+    ('POST', '/right'): 15,
+    ('GET', '/report'): 15,
+    ('POST', '/place'): 5,
+}
+'''Relative frequency of each route after a client has placed its robot'''
+
+
+class Client():
+    """A simulated API user with its own cookie jar and keep-alive connection.
+
+    Attributes:
+        cookies (SimpleCookie): Cookies set by the server
+        results (list[tuple[float, float, bool]]):
+            Scheduled time, latency in seconds and failure of every request
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        seed (int): Random seed of the routes chosen by the client
+    """
+
+    def __init__(self, host: str, port: int, seed: int) -> None:
+        """Initialise a client without connecting yet.
+
+        Args:
+            host (str): Server host
+            port (int): Server port
+            seed (int): Random seed of the routes chosen by the client
+        """
+        self.cookies = SimpleCookie()
+        self.results = []
+        self._connection = HTTPConnection(host, port, timeout=30)
+        self._random = random.Random(seed)
+        self._placed = False
+
+    def _path(self) -> tuple:
+        """Choose the method and path of the next request."""
+        method, path = ('POST', '/place')
+        if self._placed:
+            method, path = self._random.choices(list(ROUTES), list(ROUTES.values()))[0]
+        if path == '/place':
+            path += f'?x={self._random.randrange(5)}&y={self._random.randrange(5)}' \
+                    f'&direction={self._random.choice(("north", "east", "south", "west"))}'
+        return method, path
+
+    def send(self, scheduled: float) -> None:
+        """Send one request and record its latency from the scheduled time.
+
+        Args:
+            scheduled (float): perf_counter time the request was due
+        """
+        method, path = self._path()
+        headers = {}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{key}={morsel.value}'
+                                          for key, morsel in self.cookies.items())
+        try:
+            self._connection.request(method, path, headers=headers)
+            response = self._connection.getresponse()
+            response.read()
+            for cookie in response.headers.get_all('Set-Cookie') or ():
+                self.cookies.load(cookie)
+            failed = response.status >= 400
+            self._placed = self._placed or (path.startswith('/place') and not failed)
+        except (OSError, HTTPException):
+            self._connection.close()
+            failed = True
+        self.results.append((scheduled, time.perf_counter() - scheduled, failed))
+
+    def run(self, schedule: Queue) -> None:
+        """Send requests as they are scheduled until the schedule ends.
+
+        Args:
+            schedule (Queue): Scheduled times, None once the test is over
+        """
+        for scheduled in iter(schedule.get, None):
+            self.send(scheduled)
+        self._connection.close()
+
+
+def _percentile(latencies: list, fraction: float) -> float:
+    """Get a percentile of sorted latencies in milliseconds."""
+    return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000
+
+
+def summarise(results: list, interval: float) -> list:
+    """Group request results into windows of time.
+
+    Args:
+        results (list[tuple[float, float, bool]]):
+            Scheduled time from the start of the test, latency and failure of
+            every request, as returned by run
+        interval (float): Seconds in each window
+
+    Returns:
+        list[dict]: For each window its start in seconds, requests, throughput
+        in requests per second, p50, p99 and p999 latency in milliseconds and
+        error rate
+    """
+    windows = {}
+    for scheduled, latency, failed in results:
+        windows.setdefault(int(scheduled // interval), []).append((latency, failed))
+    summary = []
+    for index in sorted(windows):
+        latencies = sorted(latency for latency, _ in windows[index])
+        summary.append({
+            'start': index * interval,
+            'requests': len(latencies),
+            'throughput': len(latencies) / interval,
+            'p50': _percentile(latencies, 0.5),
+            'p99': _percentile(latencies, 0.99),
+            'p999': _percentile(latencies, 0.999),
+            'errors': sum(failed for _, failed in windows[index]) / len(latencies),
+        })
+    return summary
+
+
+def _schedule(schedule: Queue, rate: float, duration: float, clients: int) -> float:
+    """Put due times on the schedule at a fixed rate, then one None per
+    client, returning the start time."""
+    start = time.perf_counter()
+    for index in range(int(rate * duration)):
+        due = start + index / rate
+        time.sleep(max(due - time.perf_counter(), 0))
+        schedule.put(due)
+    for _ in range(clients):
+        schedule.put(None)
+    return start
+
+
+def run(url: str, clients: int, rate: float, duration: float, seed: int = 0) -> list:
+    """Drive the web API at a fixed request rate.
+
+    Args:
+        url (str): Base URL of the server, such as http://127.0.0.1:5000
+        clients (int): Number of simulated clients
+        rate (float): Requests per second to schedule
+        duration (float): Seconds to schedule requests for
+        seed (int): Random seed of the routes chosen by the clients
+
+    Returns:
+        list[tuple[float, float, bool]]:
+            Scheduled time in seconds from the start of the test, latency in
+            seconds and failure of every request
+    """
+    address = urlsplit(url)
+    pool = [Client(address.hostname, address.port or 80, seed + index)
+            for index in range(clients)]
+    schedule = Queue()
+    threads = [threading.Thread(target=client.run, args=(schedule,), daemon=True)
+               for client in pool]
+    for thread in threads:
+        thread.start()
+    start = _schedule(schedule, rate, duration, clients)
+    for thread in threads:
+        thread.join()
+    return [(scheduled - start, latency, failed)
+            for client in pool for scheduled, latency, failed in client.results]
+
+
+def serve():
+    """Start the web API on a free local port in a background thread.
+
+    Returns:
+        werkzeug.serving.BaseWSGIServer: The running server
+    """
+    # pylint: disable=import-outside-toplevel
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from app import app
+
+    class Handler(WSGIRequestHandler):
+        """Keep-alive request handler without the request log."""
+        protocol_version = 'HTTP/1.1'
+
+        def log_request(self, *args, **kwargs) -> None:
+            pass
+
+    app.secret_key = app.secret_key or 'load-test'
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    """Run a load test and print each window as a table row.
+
+    Returns:
+        int: Exit status, 1 if any request failed
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load',
+                                     description='Open-loop load test of the web API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='server base URL')
+    parser.add_argument('--serve', action='store_true',
+                        help='start the web API in this process instead of using --url')
+    parser.add_argument('--clients', type=int, default=50, help='simulated clients')
+    parser.add_argument('--rate', type=float, default=200, help='requests per second')
+    parser.add_argument('--duration', type=float, default=10, help='seconds to run for')
+    parser.add_argument('--interval', type=float, default=1, help='seconds per reported row')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the routes')
+    options = parser.parse_args()
+    url = options.url
+    if options.serve:
+        url = f'http://127.0.0.1:{serve().server_port}'
+    results = run(url, options.clients, options.rate, options.duration, options.seed)
+    windows = summarise(results, options.interval)
+    total = (summarise(results, options.duration) or [{}])[0]
+    print(f"{'second':>8} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'p999 ms':>8} {'errors':>7}")
+    for window in windows + ([dict(total, start='total')] if total else []):
+        print(f"{window['start']:>8} {window['requests']:>9} {window['throughput']:>9.1f} "
+              f"{window['p50']:>8.2f} {window['p99']:>8.2f} {window['p999']:>8.2f} "
+              f"{window['errors']:>7.2%}")
+    return 1 if total.get('errors') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
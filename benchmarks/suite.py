@@ -0,0 +1,346 @@
+"""Benchmarks covering the core, command-line and HTTP hot paths.
+
+Every benchmark is a function taking the number of steps and a seed, which
+prepares a reproducible workload and returns a callable performing a given
+number of operations. An operation may cover several robot steps, such as one
+command applied to a whole fleet. Workloads cycle through a fixed pool of
+random commands so memory use does not grow with the number of steps.
+"""
+
+import io
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import partial
+from itertools import cycle, islice
+from toyrobot.core import ToyRobot, Direction, Board, DIRECTIONS
+from toyrobot.fleet import RobotFleet, np
+from toyrobot.program import compile_script, parse_place
+from interface import CliBatch
+
+POOL = 100000
+'''Largest number of random commands generated for a workload'''
+CHUNK = 1000
+'''Number of commands in each compiled program of the program benchmark'''
+FLEET = 10000
+'''Number of robots in the fleet benchmark'''
+MIX = {'MOVE': 60, 'LEFT': 15, 'RIGHT': 15, 'REPORT': 5, 'PLACE': 5}
+'''Default relative frequency of each command in a random workload'''
+MALFORMED = ('PLACE {x},{y}', 'PLACE {x},{y},{x},{d}', 'PLACE {x},b,{d}', 'PLACE {x},{y},UP',
+             'PLACE')
+'''Malformed PLACE commands, picked for MALFORMED in a mix and formatted with a
+location and direction'''
+STARTUP = ('toyrobot.core', 'toyrobot.program', 'interface', 'wsgi', 'app')
+'''Modules whose import time is measured by the startup benchmark'''
+HEAVY = ('json', 'numpy', 'flask', 'dotenv', 'argparse', 'mmap', 'shutil')
+'''Modules reported by the startup benchmark when an import loads them'''
+
+
+def random_board(seed: int, sizes=((5, 5),), obstacles: float = 0.0) -> Board:
+    """Generate a reproducible random board.
+
+    Args:
+        seed (int): Random seed
+        sizes (Iterable[tuple[int, int]]): Width and height of the boards to pick from
+        obstacles (float): Fraction of the board covered by obstacles
+
+    Returns:
+        Board: The board
+    """
+    generator = random.Random(seed)
+    width, height = generator.choice(list(sizes))
+    blocked = generator.sample(range(width * height), int(width * height * obstacles))
+    return Board(width, height, [(cell % width, cell // width) for cell in blocked])
+
+
+def random_commands(count: int, seed: int, board: Board = None, mix: dict = None,
+                    off_plane: bool = False) -> list:
+    """Generate a reproducible list of random command lines.
+
+    Args:
+        count (int): Number of commands
+        seed (int): Random seed
+        board (Board): Optional plane the PLACE commands target
+        mix (dict[str, int]):
+            Relative frequency of each command, where MALFORMED stands for a
+            malformed PLACE command, MIX by default
+        off_plane (bool): If PLACE commands may target a location one off the plane
+
+    Returns:
+        list[str]: The command lines
+    """
+    board = Board.default(board)
+    mix = mix or MIX
+    generator = random.Random(seed)
+    margin = 1 if off_plane else 0
+    commands = []
+    for command in generator.choices(list(mix), list(mix.values()), k=count):
+        if command in ('PLACE', 'MALFORMED'):
+            template = 'PLACE {x},{y},{d}' if command == 'PLACE' else \
+                generator.choice(MALFORMED)
+            command = template.format(x=generator.randrange(-margin, board.width + margin),
+                                      y=generator.randrange(-margin, board.height + margin),
+                                      d=generator.choice(DIRECTIONS).name)
+        commands.append(command)
+    return commands
+
+
+def _peak_memory(benchmark, steps: int, seed: int, operations: int) -> int:
+    """Trace the peak memory of preparing a workload and running one batch."""
+    tracemalloc.start()
+    try:
+        benchmark(steps, seed)(operations)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _time(operation, operations: int, per_batch: int) -> tuple:
+    """Time a workload in batches, returning every batch time and the total."""
+    timings, remaining = [], operations
+    start = time.perf_counter()
+    while remaining > 0:
+        size = min(per_batch, remaining)
+        before = time.perf_counter_ns()
+        operation(size)
+        timings.append((time.perf_counter_ns() - before) / size)
+        remaining -= size
+    return sorted(timings), time.perf_counter() - start
+
+
+def measure(name: str, steps: int, seed: int = 0, batch: int = None) -> dict:
+    """Run a benchmark, timing it in batches of operations.
+
+    Args:
+        name (str): Name of the benchmark in BENCHMARKS
+        steps (int): Number of robot steps to time
+        seed (int): Random seed of the workload
+        batch (int):
+            Number of robot steps timed together, by default enough to take
+            about 1000 latency samples
+
+    Returns:
+        dict: Throughput in robot steps per second, the p50, p90 and p99
+        latency per robot step in nanoseconds, and the peak memory of the
+        workload in bytes.
+    """
+    benchmark, scale, limit = BENCHMARKS[name]
+    steps = min(steps, limit) if limit else steps
+    if batch is None:
+        batch = min(max(steps // 1000, 1), 1000)
+    operations, per_batch = max(steps // scale, 1), max(batch // scale, 1)
+    peak = _peak_memory(benchmark, steps, seed, min(per_batch, operations))
+    timings, elapsed = _time(benchmark(steps, seed), operations, per_batch)
+    return {
+        'name': name,
+        'steps': operations * scale,
+        'throughput': operations * scale / elapsed,
+        'p50': timings[len(timings) // 2] / scale,
+        'p90': timings[len(timings) * 9 // 10] / scale,
+        'p99': timings[len(timings) * 99 // 100] / scale,
+        'peak_memory': peak,
+    }
+
+
+def _runner(operations):
+    """Wrap an endless iterator of operations into a callable running n."""
+    def run(count: int) -> None:
+        for operation in islice(operations, count):
+            operation()
+    return run
+
+
+def _bind(methods: dict, command: str):
+    """Bind a random command line to the method performing it, passing the
+    parsed location and direction of a PLACE."""
+    name, *arguments = command.split(' ')
+    if name == 'PLACE':
+        return partial(methods[name], *parse_place(arguments))
+    return methods[name]
+
+
+def core_commands(steps: int, seed: int):
+    """Single toy robot stepping through random commands."""
+    robot = ToyRobot()
+    robot.place((2, 2), Direction.NORTH)
+    methods = {'MOVE': robot.move, 'LEFT': robot.left, 'RIGHT': robot.right,
+               'REPORT': robot.report, 'PLACE': robot.place}
+    pool = random_commands(min(steps, POOL), seed)
+    return _runner(cycle([_bind(methods, command) for command in pool]))
+
+
+def direction_clockwise(_steps: int, _seed: int):
+    """Direction rotated clockwise over and over."""
+    direction = [Direction.NORTH]
+
+    def run(count: int) -> None:
+        current = direction[0]
+        for _ in range(count):
+            current = current.clockwise()
+        direction[0] = current
+    return run
+
+
+def cli_parse(steps: int, seed: int):
+    """Command-line interface parsing random command lines."""
+    cli = CliBatch(io.BytesIO())
+    commands = cycle([command.lower() for command in random_commands(min(steps, POOL), seed)])
+
+    def run(count: int) -> None:
+        cli.output.seek(0)
+        for command in islice(commands, count):
+            cli.parse(command)
+    return run
+
+
+def program_run(steps: int, seed: int):
+    """Compiled programs of CHUNK random commands, one program per operation."""
+    pool = random_commands(max(min(steps, POOL), CHUNK), seed)
+    robot = ToyRobot()
+    return _runner(cycle([partial(compile_script(pool[index:index + CHUNK]).run, robot)
+                          for index in range(0, len(pool) - CHUNK + 1, CHUNK)]))
+
+
+def fleet_commands(steps: int, seed: int):
+    """Fleet of FLEET robots applying one random command per operation."""
+    fleet = RobotFleet(FLEET)
+    generator = np.random.default_rng(seed)
+    fleet.place(np.stack([generator.integers(0, ToyRobot.WIDTH, len(fleet)),
+                          generator.integers(0, ToyRobot.HEIGHT, len(fleet))], axis=1),
+                generator.integers(0, 4, len(fleet)))
+    methods = {'MOVE': fleet.move, 'LEFT': fleet.left, 'RIGHT': fleet.right,
+               'REPORT': fleet.report, 'PLACE': fleet.place}
+    return _runner(cycle([_bind(methods, command) for command in
+                          random_commands(min(max(steps // FLEET, 1), POOL), seed)]))
+
+
+def http_requests(steps: int, seed: int):
+    """Flask test client sending random commands to the web API."""
+    from app import app  # pylint: disable=import-outside-toplevel
+    app.secret_key = app.secret_key or 'benchmark'
+    client = app.test_client()
+    client.post('/place?x=2&y=2&direction=north')
+    routes = {'MOVE': ('POST', '/move'), 'LEFT': ('POST', '/left'),
+              'RIGHT': ('POST', '/right'), 'REPORT': ('GET', '/report')}
+    pool = []
+    for command in random_commands(min(steps, POOL), seed):
+        name, *arguments = command.split(' ')
+        if name == 'PLACE':
+            (x, y), direction = parse_place(arguments)
+            pool.append(('POST', f'/place?x={x}&y={y}&direction={direction.name}'))
+        else:
+            pool.append(routes[name])
+    requests = cycle(pool)
+
+    def run(count: int) -> None:
+        for method, path in islice(requests, count):
+            client.open(path, method=method)
+    return run
+
+
+BENCHMARKS = {
+    'core.commands': (core_commands, 1, None),
+    'direction.clockwise': (direction_clockwise, 1, None),
+    'cli.parse': (cli_parse, 1, None),
+    'program.run': (program_run, CHUNK, None),
+    'fleet.commands': (fleet_commands, FLEET, None),
+    'http.requests': (http_requests, 1, 10000),
+}
+'''Every benchmark with its robot steps per operation and its step limit'''
+
+
+def available() -> list:
+    """Get the benchmarks whose optional dependencies are installed.
+
+    Returns:
+        list[str]: Names of the available benchmarks
+    """
+    benchmarks = dict(BENCHMARKS)
+    if np is None:
+        del benchmarks['fleet.commands']
+    try:
+        import flask  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        del benchmarks['http.requests']
+    return list(benchmarks)
+
+
+def startup(module: str, runs: int = 5) -> dict:
+    """Time importing a module in fresh interpreters.
+
+    Args:
+        module (str): Name of the module to import
+        runs (int): Number of interpreters to start, the fastest is kept
+
+    Returns:
+        dict: Fastest import time and fastest whole process time in seconds,
+        and the HEAVY modules the import loaded.
+    """
+    code = f'import sys, time; start = time.perf_counter(); import {module}; ' \
+           f'print(time.perf_counter() - start); ' \
+           f'print(*[name for name in {HEAVY!r} if name in sys.modules])'
+    imports, processes = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                check=True, text=True).stdout.split('\n')
+        processes.append(time.perf_counter() - start)
+        imports.append(float(output[0]))
+    return {'name': module, 'seconds': min(imports), 'process': min(processes),
+            'heavy': output[1].split()}
+
+
+class _DictRobot(ToyRobot):
+    """Toy robot with an instance dict, laid out as robots were before
+    ToyRobot declared __slots__."""
+
+
+def robot_memory(count: int = 100000, board: Board = None) -> dict:
+    """Measure the bytes held by each live placed robot.
+
+    Args:
+        count (int): Number of robots to hold at once
+        board (Board): Optional plane, the default empty plane if not given
+
+    Returns:
+        dict: Bytes per robot with slots, and with an instance dict as before
+    """
+    board = Board.default(board)
+    board.transitions  # pylint: disable=pointless-statement
+    result = {'robots': count}
+    for name, cls in (('slots', ToyRobot), ('dict', _DictRobot)):
+        tracemalloc.start()
+        robots = [cls(board=board) for _ in range(count)]
+        for index, robot in enumerate(robots):
+            robot.place((index % board.width, index // board.width % board.height),
+                        DIRECTIONS[index % 4])
+            robot.move()
+        result[name] = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+        del robots
+    return result
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Find benchmarks which are slower than the baseline.
+
+    Args:
+        results (list[dict]): Results of this run
+        baseline (dict[str, dict]): Baseline results by benchmark name
+        tolerance (float): Allowed fractional drop in throughput
+
+    Returns:
+        list[tuple[str, float]]:
+            Name and throughput relative to the baseline of every regression
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous is None:
+            continue
+        ratio = result['throughput'] / previous['throughput']
+        if ratio < 1 - tolerance:
+            regressions.append((result['name'], ratio))
+    return regressions
@@ -3,7 +3,11 @@ Module to handle cli implementations of the toy robot demonstration. The base
 class 'cli'
 """
 
-from toyrobot.core import ToyRobot, Direction
+import os
+import sys
+from toyrobot.core import ToyRobot, Direction, Board
+from toyrobot.metrics import METRICS
+from toyrobot.program import parse_place
 
 class Cli():
     """Implementation of interfacing with the toy robot via command-line.
@@ -12,7 +16,7 @@ class Cli():
         HELP_STRING (str): Constant string literal of the help message
 
     Args:
-        None
+        board (Board): Optional plane for the toy robot to sit on
     """
 
     HELP_STRING = \
@@ -30,13 +34,20 @@ class Cli():
         '                   without changing the position of the robot.\n' + \
         'RIGHT              Will rotate the robot 90 degrees clockwise without\n' + \
         '                   changing the position of the robot.\n' + \
-        'REPORT             Will announce the X,Y and F of the robot.'
+        'REPORT             Will announce the X,Y and F of the robot.\n' + \
+        'STATS              Will show operation counts and latencies when\n' + \
+        '                   started with --stats.'
 
-    def __init__(self) -> None:
+    def __init__(self, board: Board = None) -> None:
         """
         Inititalise the toy robot object.
+
+        Args:
+            board (Board):
+                Optional plane for the toy robot to sit on, the default empty
+                plane is used if not given.
         """
-        self.toy_robot = ToyRobot()
+        self.toy_robot = ToyRobot(board=board)
 
     def run(self) -> None:
         """
@@ -69,6 +80,8 @@ class Cli():
             self.report()
         elif command == 'help':
             self.help()
+        elif command == 'stats':
+            self.stats()
         elif command == 'quit':
             self.quit()
         else:
@@ -83,20 +96,15 @@ class Cli():
             arguments (list[str]):
                 List of arguments given with the PLACE command. One argument in
                 the {X,Y,FACING} format can be parsed along with three arguments
-                in the {X Y FACING} format.
+                in the {X Y FACING} format. Malformed arguments are reported
+                as invalid.
         """
         try:
-            if len(arguments) == 1:
-                x, y, d = arguments[0].split(',')
-            elif len(arguments) == 3:
-                x, y, d = arguments
-            else:
-                return
-            if d.upper() not in list(Direction.__members__):
-                return
-            self.toy_robot.place((int(x), int(y)), Direction[d.upper()])
-        except KeyError:
-            ...
+            location, direction = parse_place(arguments)
+        except ValueError:
+            self.invalid(' '.join(['place', *arguments]))
+            return
+        self.toy_robot.place(location, direction)
 
     def move(self) -> None:
         """Move the toy robot forwards in the direction it is currently facing.
@@ -125,6 +133,21 @@ class Cli():
         """Display the help message to the user."""
         print(self.HELP_STRING)
 
+    def stats(self) -> None:
+        """Display the instrumentation measurements to the user."""
+        print(self.stats_message())
+
+    @staticmethod
+    def stats_message() -> str:
+        """Get the instrumentation measurements as a message.
+
+        Returns:
+            str: Table of measurements, or why there are none
+        """
+        if not METRICS.enabled:
+            return 'Instrumentation is disabled, start with --stats to enable it.'
+        return METRICS.summary()
+
     def quit(self) -> None:
         """Base method for quitting the toy robot demonstration.
         """
@@ -139,15 +162,150 @@ class Cli():
         print(f"'{message}' is not recognised. Type 'help' for help.")
 
 
+METRICS.register(Cli, 'cli', 'parse')
+
+
+class Renderer():
+    """Terminal renderer drawing a window of the plane and redrawing only the
+    cells that change.
+
+    The window is drawn in full once, and again only when the robot leaves it
+    and the window scrolls to centre the robot. Otherwise each frame moves the
+    cursor to the old and new robot cells and rewrites just those, so the cost
+    of a frame does not depend on the size of the plane.
+
+    Attributes:
+        board (Board): The plane being drawn
+        columns (int): Number of columns in the window
+        rows (int): Number of rows in the window
+        origin (tuple[int, int]): Location of the south west cell of the window
+        output (io.TextIOBase): Writer receiving the escape codes
+        ARROWS (dict[Direction, str]): Symbol of the robot facing each way
+
+    Args:
+        board (Board): The plane being drawn
+        columns (int): Optional window width, fitting the terminal by default
+        rows (int): Optional window height, fitting the terminal by default
+        output (io.TextIOBase): Optional writer, standard output by default
+    """
+    ARROWS = {Direction.NORTH: '^ ', Direction.EAST: '> ',
+              Direction.SOUTH: 'v ', Direction.WEST: '< '}
+
+    def __init__(self, board: Board, columns: int = None, rows: int = None,
+                 output=None) -> None:
+        """
+        Initialise the window, nothing is drawn until the first frame.
+
+        Args:
+            board (Board): The plane being drawn
+            columns (int):
+                Optional window width, by default the plane width limited to
+                what fits in the terminal
+            rows (int):
+                Optional window height, by default the plane height limited to
+                what fits in the terminal above a message and the prompt
+            output (io.TextIOBase):
+                Optional writer for the escape codes, standard output is used
+                if not given.
+        """
+        import shutil  # pylint: disable=import-outside-toplevel
+        size = shutil.get_terminal_size()
+        self.board = board
+        self.columns = min(board.width, columns or max(size.columns // 2, 1))
+        self.rows = min(board.height, rows or max((size.lines - 4) // 2, 1))
+        self.origin = (0, 0)
+        self.output = output if output is not None else sys.stdout
+        self._robot = None
+        self._drawn = False
+
+    def _cell(self, location: tuple, direction: Direction) -> str:
+        """Get the escape codes redrawing a single cell of the window."""
+        x, y = location[0] - self.origin[0], location[1] - self.origin[1]
+        symbol = self.ARROWS[direction] if direction is not None else \
+            '# ' if self.board.is_blocked(location) else '. '
+        return f'\033[{2 * (self.rows - 1 - y) + 1};{2 * x + 1}H{symbol}'
+
+    def _contains(self, location: tuple) -> bool:
+        """Check if a location is inside the window."""
+        return 0 <= location[0] - self.origin[0] < self.columns and \
+            0 <= location[1] - self.origin[1] < self.rows
+
+    def _scroll(self, location: tuple) -> None:
+        """Move the window to centre a location, within the plane."""
+        x = min(max(location[0] - self.columns // 2, 0), self.board.width - self.columns)
+        y = min(max(location[1] - self.rows // 2, 0), self.board.height - self.rows)
+        self.origin = (x, y)
+
+    def _frame(self) -> str:
+        """Get the escape codes drawing the whole window."""
+        left, bottom = self.origin
+        lines = []
+        for y in range(bottom + self.rows - 1, bottom - 1, -1):
+            lines.append(''.join('# ' if self.board.is_blocked((x, y)) else '. '
+                                 for x in range(left, left + self.columns)))
+        return '\033[2J\033[H' + '\n\n'.join(lines) + '\n'
+
+    def draw(self, location: tuple, direction: Direction, message: str = '') -> None:
+        """Draw a frame for the robot state and a message below the window,
+        leaving the cursor below the message.
+
+        Args:
+            location (tuple[int, int]): Robot location, None if not placed
+            direction (Direction): Robot direction, None if not placed
+            message (str): Message to show below the window
+        """
+        robot = (location, direction) if direction is not None else None
+        codes = []
+        if location is not None and not self._contains(location):
+            self._scroll(location)
+            self._drawn = False
+        if not self._drawn:
+            codes.append(self._frame())
+            self._drawn, self._robot = True, None
+        if robot != self._robot:
+            if self._robot is not None and self._contains(self._robot[0]):
+                codes.append(self._cell(self._robot[0], None))
+            if robot is not None:
+                codes.append(self._cell(*robot))
+            self._robot = robot
+        codes.append(f'\033[{2 * self.rows + 1};1H\033[J')
+        if message:
+            codes.append(message + '\n')
+        self.output.write(''.join(codes))
+        self.output.flush()
+
+    def clear(self) -> None:
+        """Clear the terminal, the next frame is drawn in full."""
+        self.output.write('\033[2J\033[H')
+        self.output.flush()
+        self._drawn = False
+
+
 class CliVisualiser(Cli):
     """A child of the Cli class which also displays a grid visualisation of the
     toy robot.
 
     Attributes:
-        _buffer: A private string to append after the next cls function
+        renderer (Renderer): Renderer of the visible window of the plane
+        _buffer: A private string to show below the grid on the next display
     """
     _buffer: str = ''
 
+    def __init__(self, board: Board = None, renderer: Renderer = None) -> None:
+        """
+        Inititalise the toy robot object and its renderer.
+
+        Args:
+            board (Board):
+                Optional plane for the toy robot to sit on, the default empty
+                plane is used if not given.
+            renderer (Renderer):
+                Optional renderer, one fitting the terminal is used if not
+                given.
+        """
+        super().__init__(board)
+        self.renderer = renderer if renderer is not None else Renderer(self.toy_robot.board)
+
     def run(self) -> None:
         command = None
         while command != 'quit':
@@ -156,26 +314,12 @@ class CliVisualiser(Cli):
             self.parse(command)
 
     def display(self) -> None:
-        """Displays the grid visualisation of the toy robot to the user.
+        """Displays the grid visualisation of the toy robot to the user,
+        redrawing only what changed since the last display.
         """
         location, direction = self.toy_robot.report()
-        visualisation = '\033c'
-        for i in range(self.toy_robot.HEIGHT-1, -1, -1):
-            for j in range(self.toy_robot.WIDTH):
-                if (j, i) == location:
-                    visualisation += '^ ' if direction == Direction.NORTH else \
-                                     '> ' if direction == Direction.EAST else \
-                                     'v ' if direction == Direction.SOUTH else \
-                                     '< '
-                else:
-                    visualisation += '. '
-            visualisation += '\n\n'
-
-        if self._buffer != '':
-            visualisation += self._buffer
-            self._buffer = ''
-
-        print(visualisation)
+        self.renderer.draw(location, direction, self._buffer)
+        self._buffer = ''
 
     def report(self) -> None:
         location, direction = self.toy_robot.report()
@@ -186,12 +330,126 @@ class CliVisualiser(Cli):
     def help(self):
         self._buffer = self.HELP_STRING
 
+    def stats(self) -> None:
+        self._buffer = self.stats_message()
+
     def quit(self) -> None:
-        print('\033c')
+        self.renderer.clear()
 
     def invalid(self, message) -> None:
         self._buffer = f"'{message}' is not recognised. Type 'help' for help."
 
 
+class CliBatch(Cli):
+    """A non-interactive child of the Cli class which streams commands from a
+    file or standard input and writes output through a buffered writer.
+
+    Commands are read one line at a time so memory use does not grow with the
+    size of the input. Regular files are memory-mapped rather than read.
+    Blank lines are skipped and a QUIT command ends the batch.
+
+    Attributes:
+        output (io.BufferedIOBase): Binary writer receiving all output
+
+    Args:
+        output (io.BufferedIOBase): Optional binary writer, standard output
+        board (Board): Optional plane for the toy robot to sit on
+    """
+
+    def __init__(self, output=None, board: Board = None) -> None:
+        """
+        Inititalise the toy robot object and the output writer.
+
+        Args:
+            output (io.BufferedIOBase):
+                Optional binary writer for output, the standard output buffer
+                is used if not given.
+            board (Board):
+                Optional plane for the toy robot to sit on, the default empty
+                plane is used if not given.
+        """
+        super().__init__(board)
+        self.output = output if output is not None else sys.stdout.buffer
+
+    def run(self, source: str = '-') -> None:
+        """
+        Parse every command from the given source.
+
+        Args:
+            source (str):
+                Path of the command file, or '-' for standard input
+        """
+        self.execute(self.lines(source))
+
+    def execute(self, lines) -> None:
+        """
+        Parse every command from an iterable of raw lines. Lines which are not
+        valid UTF-8 are reported as invalid and skipped.
+
+        Args:
+            lines (Iterable[bytes]): Raw command lines
+        """
+        for line in lines:
+            try:
+                command = line.decode().lower().strip()
+            except UnicodeDecodeError:
+                self.invalid(line.decode(errors='replace').strip())
+                continue
+            if command == 'quit':
+                break
+            if command:
+                self.parse(command)
+        self.output.flush()
+
+    @staticmethod
+    def lines(source: str = '-'):
+        """Stream the raw lines of a command source.
+
+        Args:
+            source (str):
+                Path of the command file, or '-' for standard input
+
+        Yields:
+            bytes: Each line of the source
+        """
+        if source == '-':
+            yield from sys.stdin.buffer
+            return
+        import mmap  # pylint: disable=import-outside-toplevel
+        with open(source, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from iter(mapped.readline, b'')
+
+    def report(self) -> None:
+        location, direction = self.toy_robot.report()
+        if direction is None:
+            return
+        self.output.write(f'Output: {location[0]},{location[1]},{direction}\n'.encode())
+
+    def help(self) -> None:
+        self.output.write(f'{self.HELP_STRING}\n'.encode())
+
+    def stats(self) -> None:
+        self.output.write(f'{self.stats_message()}\n'.encode())
+
+    def invalid(self, message: str) -> None:
+        self.output.write(f"'{message}' is not recognised. Type 'help' for help.\n".encode())
+
+
 if __name__ == '__main__':
-    CliVisualiser().run()
+    import argparse
+    parser = argparse.ArgumentParser(description='Toy robot demonstration')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from FILE, or '-' for standard input, "
+                             "without the visualiser")
+    parser.add_argument('--stats', action='store_true',
+                        help='record operation counts and latencies for the STATS command')
+    options = parser.parse_args()
+    if options.stats:
+        METRICS.enable()
+    if options.batch:
+        CliBatch().run(options.batch)
+    else:
+        CliVisualiser().run()
@@ -0,0 +1,126 @@
+"""
+Module to run many independent command scripts in parallel across a pool of
+processes, with each script parsed exactly as the batch command-line
+interface would parse it.
+
+Scripts are sent to the workers in chunks so the cost of passing work between
+processes is shared by many scripts, and the plane is sent once to each worker
+rather than with every chunk.
+"""
+
+import argparse
+import io
+import os
+import sys
+from multiprocessing import Pool
+from interface import CliBatch
+from toyrobot.core import Board
+
+_WORKER = {}
+'''Plane of the current worker process, set once by _initialise'''
+
+
+def _initialise(width: int, height: int, obstacles: list) -> None:
+    """Build the plane of a worker process."""
+    _WORKER['board'] = Board(width, height, obstacles)
+
+
+def _run(script: str) -> bytes:
+    """Run a single script on a new robot, returning its output."""
+    cli = CliBatch(io.BytesIO(), _WORKER['board'])
+    cli.execute(script.encode().splitlines())
+    return cli.output.getvalue()
+
+
+def _run_indexed(item: tuple) -> tuple:
+    """Run a single script, returning its output with its position."""
+    index, script = item
+    return index, _run(script)
+
+
+class ParallelRunner():
+    """Runs independent command scripts on a pool of worker processes.
+
+    Each script runs on its own new toy robot, so results never depend on
+    which worker ran a script.
+
+    Attributes:
+        processes (int): Number of worker processes
+        chunksize (int): Scripts sent to a worker at once, None to pick one
+        board (Board): The plane every robot sits on
+
+    Args:
+        processes (int): Optional number of workers, the number of CPUs
+        chunksize (int): Optional number of scripts sent to a worker at once
+        board (Board): Optional plane, the default empty plane if not given
+    """
+
+    def __init__(self, processes: int = None, chunksize: int = None,
+                 board: Board = None) -> None:
+        """Initialise a runner, the pool is only started by map or as_completed.
+
+        Args:
+            processes (int): Optional number of workers, the number of CPUs
+            chunksize (int):
+                Optional number of scripts sent to a worker at once, by default
+                enough for about four chunks per worker
+            board (Board):
+                Optional plane, an empty ToyRobot.WIDTH by ToyRobot.HEIGHT
+                plane is used by default.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.board = Board.default(board)
+
+    def _pool(self) -> Pool:
+        """Start a pool of workers sharing the plane."""
+        width = self.board.width
+        obstacles = [(cell % width, cell // width) for cell in self.board.obstacle_cells()]
+        return Pool(self.processes, _initialise, (width, self.board.height, obstacles))
+
+    def _chunksize(self, count: int) -> int:
+        """Pick the number of scripts sent to a worker at once."""
+        if self.chunksize:
+            return self.chunksize
+        return max(count // (self.processes * 4), 1)
+
+    def map(self, scripts: list):
+        """Run every script, yielding outputs in the order of the scripts.
+
+        Args:
+            scripts (list[str]): Command scripts, one command per line
+
+        Yields:
+            bytes: Output of each script, as CliBatch would write it
+        """
+        with self._pool() as pool:
+            yield from pool.imap(_run, scripts, self._chunksize(len(scripts)))
+
+    def as_completed(self, scripts: list):
+        """Run every script, yielding outputs as soon as each chunk completes.
+
+        Args:
+            scripts (list[str]): Command scripts, one command per line
+
+        Yields:
+            tuple[int, bytes]: Position and output of each script
+        """
+        with self._pool() as pool:
+            yield from pool.imap_unordered(_run_indexed, enumerate(scripts),
+                                           self._chunksize(len(scripts)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run toy robot scripts in parallel')
+    parser.add_argument('scripts', nargs='+', metavar='FILE', help='command script files')
+    parser.add_argument('--processes', type=int, help='number of workers (default CPUs)')
+    parser.add_argument('--chunksize', type=int, help='scripts sent to a worker at once')
+    options = parser.parse_args()
+    contents = []
+    for path in options.scripts:
+        with open(path, encoding='utf-8') as file:
+            contents.append(file.read())
+    runner = ParallelRunner(options.processes, options.chunksize)
+    for name, output in zip(options.scripts, runner.map(contents)):
+        sys.stdout.buffer.write(f'==> {name} <==\n'.encode() + output)
+    sys.stdout.flush()
@@ -0,0 +1,236 @@
+"""Differential testing of toy robot engines against the reference semantics.
+
+A seeded generator lazily streams random cases, each a board and a script of
+command lines from the random_board and random_commands workload generators of
+the benchmark suite, with configurable board sizes, obstacle density, command
+mix and script length. The mix may include MALFORMED, a malformed PLACE
+command, and PLACE commands may target locations just off the plane.
+Every engine runs each case and the robot reports it observes are compared
+with those of the reference Cli driving a ToyRobot. Engines compile whole
+scripts, so a script holding a line the Cli reports as invalid must be
+rejected by the engine as a whole. The first divergence is shrunk by
+removing commands for as long as the engine still diverges, leaving a
+minimal reproducing script.
+
+Run with 'python -m tests.differential', see 'python -m tests.differential
+--help'.
+"""
+
+import argparse
+import random
+import sys
+from itertools import islice
+from benchmarks.suite import MIX, random_board, random_commands
+from interface import Cli
+from toyrobot.core import ToyRobot, Board, DIRECTIONS
+from toyrobot.fleet import RobotFleet, np
+from toyrobot.program import compile_script
+from toyrobot.world import World
+
+REJECTED = ['rejected']
+'''Result of a script holding a line the reference reports as invalid'''
+
+
+class _RecordingCli(Cli):
+    """Reference command-line interface recording reports instead of printing."""
+
+    def __init__(self, board: Board) -> None:
+        super().__init__(board)
+        self.reports = []
+        self.rejected = []
+
+    def report(self) -> None:
+        location, direction = self.toy_robot.report()
+        if direction is not None:
+            self.reports.append((location, direction))
+
+    def invalid(self, message: str) -> None:
+        self.rejected.append(message)
+
+
+def cases(seed: int, sizes=((5, 5),), length: int = 100, mix: dict = None,
+          obstacles: float = 0.0):
+    """Lazily generate an endless stream of reproducible random cases.
+
+    Args:
+        seed (int): Random seed
+        sizes (Iterable[tuple[int, int]]): Width and height of the boards to pick from
+        length (int): Number of commands in each script
+        mix (dict[str, int]):
+            Relative frequency of each command, including MALFORMED, MIX by
+            default
+        obstacles (float): Fraction of each board covered by obstacles
+
+    Yields:
+        tuple[Board, list[str]]: A board and a script of command lines
+    """
+    generator, sizes = random.Random(seed), list(sizes)
+    while True:
+        board = random_board(generator.getrandbits(64), sizes, obstacles)
+        yield board, random_commands(length, generator.getrandbits(64), board, mix,
+                                     off_plane=True)
+
+
+def reference(board: Board, script: list) -> list:
+    """Run a script through the command-line interface on a ToyRobot.
+
+    Args:
+        board (Board): The plane the robot sits on
+        script (list[str]): Command lines
+
+    Returns:
+        list[tuple[tuple[int, int], Direction]]:
+            The report of every REPORT command while placed, then the final
+            report, or REJECTED if any line was reported as invalid
+    """
+    cli = _RecordingCli(board)
+    for line in script:
+        cli.parse(line.lower().strip())
+    if cli.rejected:
+        return REJECTED
+    return cli.reports + [cli.toy_robot.report()]
+
+
+def program_engine(board: Board, script: list) -> list:
+    """Run a script as a compiled program."""
+    robot = ToyRobot(board=board)
+    return compile_script(script).run(robot) + [robot.report()]
+
+
+def world_engine(board: Board, script: list) -> list:
+    """Run a script on the only robot of a world."""
+    robot = World(board).spawn()
+    return compile_script(script).run(robot) + [robot.report()]
+
+
+def fleet_engine(board: Board, script: list) -> list:
+    """Run a script on every robot of a small fleet, which must agree."""
+    fleet = RobotFleet(3, board)
+    reports = []
+    for locations, headings in compile_script(script).run_fleet(fleet) + [fleet.report()]:
+        if not (np.all(locations == locations[0]) and np.all(headings == headings[0])):
+            return reports + ['fleet robots disagree']
+        if headings[0] != RobotFleet.UNPLACED:
+            reports.append((tuple(int(value) for value in locations[0]),
+                            DIRECTIONS[headings[0]]))
+    if fleet.headings[0] == RobotFleet.UNPLACED:
+        reports.append((None, None))
+    return reports
+
+
+ENGINES = {'program': program_engine, 'world': world_engine, 'fleet': fleet_engine}
+'''Every engine checked against the reference semantics'''
+
+
+def diverges(engine, board: Board, script: list) -> bool:
+    """Check if an engine disagrees with the reference on a script.
+
+    Args:
+        engine (Callable): Engine taking a board and script, returning reports
+        board (Board): The plane the robot sits on
+        script (list[str]): Command lines
+
+    Returns:
+        bool: If the reports differ, an engine raising ValueError rejects the
+        script
+    """
+    try:
+        reports = engine(board, script)
+    except ValueError:
+        reports = REJECTED
+    return reports != reference(board, script)
+
+
+def shrink(engine, board: Board, script: list) -> list:
+    """Shrink a diverging script by removing ever smaller runs of commands
+    for as long as the engine still diverges.
+
+    Args:
+        engine (Callable): Engine taking a board and script, returning reports
+        board (Board): The plane the robot sits on
+        script (list[str]): Diverging command lines
+
+    Returns:
+        list[str]: A diverging script from which no single command can be removed
+    """
+    size = len(script) // 2
+    while size >= 1:
+        index, removed = 0, False
+        while index < len(script):
+            candidate = script[:index] + script[index + size:]
+            if candidate and diverges(engine, board, candidate):
+                script, removed = candidate, True
+            else:
+                index += size
+        if not removed:
+            size //= 2
+    return script
+
+
+def check(engine, workload, commands: int) -> tuple:
+    """Run cases from a workload through an engine until enough commands ran.
+
+    Args:
+        engine (Callable): Engine taking a board and script, returning reports
+        workload (Iterator[tuple[Board, list[str]]]): Cases, such as from cases
+        commands (int): Number of commands to check
+
+    Returns:
+        tuple[Board, list[str]]:
+            The board and shrunk script of the first divergence, or None if
+            the engine always agreed
+    """
+    checked = 0
+    for board, script in workload:
+        if checked >= commands:
+            return None
+        if diverges(engine, board, script):
+            return board, shrink(engine, board, script)
+        checked += len(script)
+    return None
+
+
+def main() -> int:
+    """Check engines against the reference semantics.
+
+    Returns:
+        int: Exit status, 1 if any engine diverged
+    """
+    parser = argparse.ArgumentParser(prog='python -m tests.differential',
+                                     description='Differential testing of toy robot engines')
+    parser.add_argument('--engines', nargs='*', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--commands', type=int, default=10 ** 6,
+                        help='commands checked per engine (default 10^6)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the workloads')
+    parser.add_argument('--sizes', nargs='*', default=['5x5'], metavar='WxH',
+                        help='board sizes to pick from (default 5x5)')
+    parser.add_argument('--length', type=int, default=100, help='commands per script')
+    parser.add_argument('--obstacles', type=float, default=0.0,
+                        help='fraction of each board covered by obstacles')
+    parser.add_argument('--malformed', type=int, default=1,
+                        help='relative frequency of malformed PLACE commands, out of '
+                             f'{sum(MIX.values())} for the rest')
+    options = parser.parse_args()
+    sizes = [tuple(int(value) for value in size.split('x')) for size in options.sizes]
+    status = 0
+    for name in options.engines:
+        if name == 'fleet' and np is None:
+            print(f'{name}: skipped, numpy is not installed')
+            continue
+        workload = cases(options.seed, sizes, options.length,
+                         dict(MIX, MALFORMED=options.malformed), options.obstacles)
+        divergence = check(ENGINES[name], workload, options.commands)
+        if divergence is None:
+            print(f'{name}: agreed on {options.commands} commands')
+            continue
+        board, script = divergence
+        status = 1
+        obstacles = [(cell % board.width, cell // board.width) for cell in board.obstacle_cells()]
+        print(f'{name}: diverged on a {board.width}x{board.height} board with obstacles at '
+              f'{obstacles}')
+        print('\n'.join(f'    {line}' for line in islice(script, 50)))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
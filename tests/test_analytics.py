@@ -0,0 +1,58 @@
+"""Module providing unit testing of script analytics"""
+import unittest
+from toyrobot.core import ToyRobot, Board, DIRECTIONS
+from toyrobot.fleet import np
+from toyrobot.analytics import analyse
+
+SCRIPT = ['MOVE', 'MOVE', 'RIGHT', 'MOVE', 'REPORT', 'LEFT', 'MOVE', 'MOVE', 'MOVE']
+'''Script analysed by the tests'''
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestAnalyse(unittest.TestCase):
+    """
+    A class to test running a script from every start state at once.
+    """
+    def setUp(self):
+        '''Analyse the script on a board with obstacles'''
+        self.board = Board(6, 4, [(2, 1), (4, 3)])
+        self.analysis = analyse(SCRIPT, self.board)
+
+    def test_final(self):
+        '''Analyse a script, ensure every final state matches a single robot'''
+        visits = np.zeros((self.board.height, self.board.width), dtype=np.int64)
+        for y in range(self.board.height):
+            for x in range(self.board.width):
+                for direction in DIRECTIONS:
+                    toyrobot = ToyRobot(board=self.board)
+                    if not toyrobot.place((x, y), direction):
+                        continue
+                    for command in SCRIPT:
+                        if command == 'MOVE' and toyrobot.move():
+                            visits[toyrobot.location[1], toyrobot.location[0]] += 1
+                        elif command in ('LEFT', 'RIGHT'):
+                            getattr(toyrobot, command.lower())()
+                    self.assertEqual(self.analysis.final_state((x, y), direction),
+                                     toyrobot.report())
+        self.assertEqual(self.analysis.visits.tolist(), visits.tolist())
+        self.assertEqual(len(self.analysis.starts), (self.board.size - 2) * 4)
+        self.assertIsNone(self.analysis.final_state((2, 1), DIRECTIONS[0]))
+
+    def test_place(self):
+        '''Analyse a script starting with PLACE, ensure every robot ends together'''
+        analysis = analyse('PLACE 1,1,EAST\nMOVE\nMOVE\nMOVE')
+        self.assertEqual(analysis.endings[1, 4], 100)
+        self.assertEqual(int(analysis.endings.sum()), 100)
+        self.assertEqual(analysis.coverage(), 4 / 25)
+
+    def test_coverage(self):
+        '''Analyse scripts which move no robot, ensure nothing is covered'''
+        board = Board.empty(50, 50)
+        for script in ('', 'LEFT', 'RIGHT\nREPORT'):
+            analysis = analyse(script, board)
+            self.assertEqual(analysis.coverage(), 0.0)
+            self.assertEqual(int(analysis.visits.sum()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Module providing unit testing of the web API"""
+import unittest
+import app as api
+from app import app
+from toyrobot.store import MemoryStore
+
+
+class TestCommands(unittest.TestCase):
+    """
+    A class to test applying batches of commands through the web API.
+    """
+    def setUp(self):
+        '''Create a test client with a fresh session before each test'''
+        app.secret_key = 'testing'
+        self.client = app.test_client()
+
+    def test_list(self):
+        '''Send a json list of commands, ensure the final state is returned'''
+        response = self.client.post('/commands', json=['PLACE 0,0,NORTH', 'MOVE', 'RIGHT',
+                                                       'MOVE', 'MOVE'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['state'],
+                         {'location': {'x': 2, 'y': 1}, 'direction': 'EAST'})
+        self.assertNotIn('reports', response.json)
+
+    def test_script(self):
+        '''Send a plain text script, ensure the session robot is used'''
+        self.client.post('/place?x=4&y=4&direction=south')
+        response = self.client.post('/commands?reports=true', data='MOVE\nREPORT\nLEFT\nREPORT')
+        self.assertEqual(response.json['reports'], [
+            {'location': {'x': 4, 'y': 3}, 'direction': 'SOUTH'},
+            {'location': {'x': 4, 'y': 3}, 'direction': 'EAST'},
+        ])
+        self.assertEqual(self.client.get('/report').json['location'], [4, 3])
+
+    def test_invalid(self):
+        '''Send an unknown command, ensure the request is rejected'''
+        response = self.client.post('/commands', json={'commands': ['PLACE 0,0,NORTH', 'JUMP']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unplaced(self):
+        '''Send commands without ever placing the robot, ensure it is rejected'''
+        response = self.client.post('/commands', json=['MOVE', 'LEFT'])
+        self.assertEqual(response.status_code, 400)
+
+
+class TestStore(unittest.TestCase):
+    """
+    A class to test keeping robots in a server-side state store.
+    """
+    def setUp(self):
+        '''Use an in-process state store for each test'''
+        app.secret_key = 'testing'
+        self.store = api.store = MemoryStore()
+
+    def tearDown(self):
+        '''Go back to keeping robots in the session'''
+        api.store = None
+
+    def test_shared(self):
+        '''Place a robot by ID, ensure another client can command it'''
+        app.test_client().post('/place?x=1&y=1&direction=north&robot=shared')
+        response = app.test_client().post('/move?robot=shared')
+        self.assertEqual(response.json['state'],
+                         {'location': {'x': 1, 'y': 2}, 'direction': 'NORTH'})
+        self.assertEqual(len(self.store), 1)
+
+    def test_session(self):
+        '''Place a robot without an ID, ensure the session only holds its ID'''
+        client = app.test_client()
+        client.post('/place?x=3&y=0&direction=west')
+        client.post('/move')
+        with client.session_transaction() as session:
+            self.assertNotIn('robot_state', session)
+            robot_id = session['robot_id']
+        self.assertEqual(self.store.get(robot_id) & 3, 3)
+        self.assertEqual(client.get('/report').json['location'], [2, 0])
+
+
+class TestReport(unittest.TestCase):
+    """
+    A class to test caching reports with entity tags.
+    """
+    def setUp(self):
+        '''Create a test client with a placed robot before each test'''
+        app.secret_key = 'testing'
+        self.client = app.test_client()
+        self.client.post('/place?x=0&y=4&direction=north')
+
+    def test_not_modified(self):
+        '''Report twice with the ETag, ensure the second report is empty'''
+        first = self.client.get('/report')
+        self.assertEqual(first.json['location'], [0, 4])
+        second = self.client.get('/report', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual((second.status_code, second.data), (304, b''))
+
+    def test_rejected(self):
+        '''Move off the plane, ensure the cached report stays valid'''
+        etag = self.client.get('/report').headers['ETag']
+        hits = api.report_body.cache_info().hits
+        self.client.post('/move')
+        self.assertEqual(self.client.get('/report', headers={'If-None-Match': etag}).status_code,
+                         304)
+        self.client.get('/report')
+        self.assertEqual(api.report_body.cache_info().hits, hits + 1)
+
+    def test_changed(self):
+        '''Rotate the robot, ensure the report and its ETag change'''
+        etag = self.client.get('/report').headers['ETag']
+        self.client.post('/right')
+        response = self.client.get('/report', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.json['direction'], 'EAST')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Module providing unit testing of the asynchronous web API"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from asgi import RobotApp
+from toyrobot.store import SqliteStore
+
+
+async def request(application: RobotApp, method: str, path: str, query: str = '') -> tuple:
+    '''Send a single request to the application and collect the response'''
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application({'type': 'http', 'method': method, 'path': path,
+                       'query_string': query.encode(), 'headers': []}, receive, send)
+    return messages[0]['status'], json.loads(messages[1]['body'])
+
+
+class TestRoutes(unittest.TestCase):
+    """
+    A class to test the routes of the asynchronous web API.
+    """
+    def setUp(self):
+        '''Create an application with an in-process store'''
+        self.application = RobotApp()
+
+    def run_requests(self, *requests):
+        '''Send requests one after another, returning every response'''
+        async def run():
+            return [await request(self.application, *arguments) for arguments in requests]
+        return asyncio.run(run())
+
+    def test_commands(self):
+        '''Place, move and rotate a robot, ensure the report matches'''
+        responses = self.run_requests(
+            ('POST', '/place', 'robot=a&x=1&y=1&direction=north'),
+            ('POST', '/move', 'robot=a'),
+            ('POST', '/right', 'robot=a'),
+            ('POST', '/move', 'robot=a'),
+            ('POST', '/left', 'robot=a'),
+            ('GET', '/report', 'robot=a'),
+        )
+        self.assertEqual(responses[-1], (200, {
+            'location': [2, 2], 'direction': 'NORTH',
+            'state': {'location': {'x': 2, 'y': 2}, 'direction': 'NORTH'}}))
+
+    def test_invalid(self):
+        '''Send invalid requests, ensure they are rejected'''
+        responses = self.run_requests(
+            ('POST', '/move', 'robot=b'),
+            ('POST', '/place', 'robot=b&x=9&y=1'),
+            ('POST', '/place', 'robot=b&x=one&y=1'),
+            ('GET', '/jump', 'robot=b'),
+        )
+        self.assertEqual([status for status, _ in responses], [400, 400, 400, 404])
+
+    def test_serialised(self):
+        '''Send concurrent moves to one robot in a shared database, ensure no
+        move is lost'''
+        with tempfile.TemporaryDirectory() as directory:
+            store = SqliteStore(os.path.join(directory, 'robots.db'))
+            self.application = RobotApp(store)
+
+            async def run():
+                await request(self.application, 'POST', '/place', 'robot=c&x=0&y=0&direction=north')
+                await asyncio.gather(*[request(self.application, 'POST', '/move', 'robot=c')
+                                       for _ in range(4)])
+                return await request(self.application, 'GET', '/report', 'robot=c')
+            _, body = asyncio.run(run())
+            store.close()
+        self.assertEqual(body['location'], [0, 4])
+
+
+class TestStream(unittest.TestCase):
+    """
+    A class to test controlling a robot over the WebSocket channel.
+    """
+    def converse(self, path, messages):
+        '''Open a WebSocket, send each message and collect every reply'''
+        application, sent = RobotApp(), []
+        incoming = [{'type': 'websocket.connect'}] + \
+                   [{'type': 'websocket.receive', 'text': text} for text in messages] + \
+                   [{'type': 'websocket.disconnect', 'code': 1000}]
+
+        async def receive():
+            return incoming.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(application({'type': 'websocket', 'path': path,
+                                 'query_string': b'robot=d', 'headers': []}, receive, send))
+        return application, sent
+
+    def test_stream(self):
+        '''Stream commands to a robot, ensure each message gets a state update'''
+        application, sent = self.converse('/stream', ['PLACE 0,0,EAST', 'MOVE\nMOVE\nREPORT',
+                                                      'JUMP', 'LEFT'])
+        self.assertEqual(sent[0]['type'], 'websocket.accept')
+        replies = [json.loads(message['text']) for message in sent[1:]]
+        self.assertEqual(replies[1]['reports'],
+                         [{'location': {'x': 2, 'y': 0}, 'direction': 'EAST'}])
+        self.assertEqual(replies[2], {'message': "'jump' is not recognised"})
+        self.assertEqual(replies[3]['state'], {'location': {'x': 2, 'y': 0}, 'direction': 'NORTH'})
+        self.assertIsNotNone(application.store.get('d'))
+
+    def test_mixed(self):
+        '''Send HTTP commands to a streamed robot between messages, ensure no
+        acknowledged command is lost'''
+        application, sent, moves = RobotApp(), [], []
+        incoming = [{'type': 'websocket.connect'},
+                    {'type': 'websocket.receive', 'text': 'PLACE 0,0,NORTH'},
+                    {'type': 'websocket.receive', 'text': 'RIGHT'},
+                    {'type': 'websocket.disconnect', 'code': 1000}]
+
+        async def receive():
+            if len(incoming) == 2:
+                for _ in range(2):
+                    moves.append(await request(application, 'POST', '/move', 'robot=z'))
+            return incoming.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        async def run():
+            await application({'type': 'websocket', 'path': '/stream',
+                               'query_string': b'robot=z', 'headers': []}, receive, send)
+            return await request(application, 'GET', '/report', 'robot=z')
+        _, body = asyncio.run(run())
+        self.assertEqual([(status, reply['message']) for status, reply in moves],
+                         [(200, 'Moved')] * 2)
+        self.assertEqual(json.loads(sent[-1]['text'])['state'],
+                         {'location': {'x': 0, 'y': 2}, 'direction': 'EAST'})
+        self.assertEqual((body['location'], body['direction']), ([0, 2], 'EAST'))
+
+    def test_unknown(self):
+        '''Open a WebSocket on an unknown path, ensure it is closed'''
+        _, sent = self.converse('/jump', [])
+        self.assertEqual(sent, [{'type': 'websocket.close', 'code': 1008}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Module providing unit testing of the benchmark suite"""
+import unittest
+from benchmarks.load import run, serve, summarise
+from benchmarks.suite import available, compare, measure, random_commands, robot_memory, startup
+
+
+class TestSuite(unittest.TestCase):
+    """
+    A class to test the benchmark suite on tiny workloads.
+    """
+    def test_reproducible(self):
+        '''Generate workloads twice with one seed, ensure they match'''
+        self.assertEqual(random_commands(500, 7), random_commands(500, 7))
+        self.assertNotEqual(random_commands(500, 7), random_commands(500, 8))
+
+    def test_measure(self):
+        '''Run every available benchmark briefly, ensure results are complete'''
+        for name in available():
+            result = measure(name, 100)
+            self.assertGreater(result['throughput'], 0)
+            self.assertLessEqual(result['p50'], result['p99'])
+
+    def test_compare(self):
+        '''Compare results against a faster baseline, ensure it is flagged'''
+        baseline = {'a': {'throughput': 100.0}, 'b': {'throughput': 100.0}}
+        results = [{'name': 'a', 'throughput': 90.0}, {'name': 'b', 'throughput': 50.0},
+                   {'name': 'c', 'throughput': 1.0}]
+        self.assertEqual(compare(results, baseline, 0.25), [('b', 0.5)])
+
+    def test_startup(self):
+        '''Time the lean entry points, ensure they import no heavy modules'''
+        for module in ('toyrobot.core', 'toyrobot.program', 'interface', 'wsgi'):
+            result = startup(module, runs=1)
+            self.assertEqual(result['heavy'], [])
+            self.assertLess(result['seconds'], result['process'])
+
+    def test_robot_memory(self):
+        '''Measure live robots, ensure slotted robots are smaller'''
+        result = robot_memory(1000)
+        self.assertLess(result['slots'], result['dict'])
+
+
+class TestLoad(unittest.TestCase):
+    """
+    A class to test the load test against a local web API.
+    """
+    def test_summarise(self):
+        '''Summarise known results, ensure windows and percentiles are correct'''
+        results = [(0.1 * index, 0.001 * index, index == 3) for index in range(20)]
+        windows = summarise(results, 1.0)
+        self.assertEqual([window['requests'] for window in windows], [10, 10])
+        self.assertAlmostEqual(windows[0]['p50'], 5.0)
+        self.assertAlmostEqual(windows[1]['p999'], 19.0)
+        self.assertEqual([window['errors'] for window in windows], [0.1, 0.0])
+
+    def test_run(self):
+        '''Drive a local server briefly, ensure every request succeeds'''
+        server = serve()
+        try:
+            results = run(f'http://127.0.0.1:{server.server_port}', 4, 100, 1)
+        finally:
+            server.shutdown()
+        total = summarise(results, 1.0)[0]
+        self.assertEqual(total['requests'], 100)
+        self.assertEqual(total['errors'], 0)
+        self.assertEqual(sum(window['requests'] for window in summarise(results, 0.5)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
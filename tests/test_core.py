@@ -1,7 +1,8 @@
 """Module providing unit testing capabilities"""
 import unittest
 import json
-from toyrobot.core import ToyRobot, Direction
+from toyrobot.core import ToyRobot, Direction, Board
+from toyrobot.fleet import RobotFleet, np
 
 
 class TestInit(unittest.TestCase):
@@ -14,6 +15,13 @@ class TestInit(unittest.TestCase):
         self.assertEqual(toyrobot.location, None)
         self.assertEqual(toyrobot.direction, None)
 
+    def test_slots(self):
+        '''Initialise a new toy robot and ensure it has no instance dict'''
+        toyrobot = ToyRobot()
+        self.assertFalse(hasattr(toyrobot, '__dict__'))
+        with self.assertRaises(AttributeError):
+            setattr(toyrobot, 'name', 'robot')
+
     def test_init(self):
         '''Initialise a new toy robot and ensure it has valid attributes'''
         state = json.dumps({'location': {'x': 1, 'y': 3}, 'direction': 'SOUTH'})
@@ -163,5 +171,223 @@ class TestBoundaries(unittest.TestCase):
         self.assertEqual(self.toyrobot.location, (2, 0))
 
 
+class TestTransitionTable(unittest.TestCase):
+    """
+    A class to test the precomputed state transition table.
+    """
+    def test_shared(self):
+        '''Get the table for a plane twice, ensure it is only built once'''
+        self.assertIs(Board.empty(5, 5).transitions, ToyRobot().board.transitions)
+        self.assertIsNot(Board.empty(5, 5).transitions, Board.empty(6, 5).transitions)
+
+    def test_roundtrip(self):
+        '''Encode and decode every state, ensure it is unchanged'''
+        table = Board.empty(3, 4).transitions
+        for location in table.cells:
+            for direction in Direction:
+                state = table.encode(location, direction)
+                self.assertEqual(table.decode(state), (location, direction))
+
+    def test_transitions(self):
+        '''Ensure each command leads to the state ToyRobot semantics expect'''
+        table = Board.empty(3, 4).transitions
+        state = table.encode((2, 3), Direction.NORTH)
+        self.assertEqual(table.move[state], state)
+        self.assertEqual(table.decode(table.left[state]), ((2, 3), Direction.WEST))
+        self.assertEqual(table.decode(table.right[state]), ((2, 3), Direction.EAST))
+        state = table.encode((2, 3), Direction.SOUTH)
+        self.assertEqual(table.decode(table.move[state]), ((2, 2), Direction.SOUTH))
+
+    def test_rotations(self):
+        '''Rotate each direction, ensure it matches the direction table'''
+        for index, direction in enumerate(Direction):
+            self.assertIs(direction.clockwise(), Direction.from_integer(index + 1))
+            self.assertIs(direction.counterclockwise(), Direction.from_integer(index - 1))
+            self.assertIs(direction.clockwise().counterclockwise(), direction)
+
+    def test_shared_location(self):
+        '''Move a robot back and forth, ensure its location is not reallocated'''
+        toyrobot = ToyRobot()
+        toyrobot.place((2, 2), Direction.EAST)
+        location = toyrobot.location
+        toyrobot.move()
+        toyrobot.rotate(2)
+        toyrobot.move()
+        self.assertIs(toyrobot.location, location)
+
+
+class TestBoard(unittest.TestCase):
+    """
+    A class to test configurable boards with obstacles.
+    """
+    def setUp(self):
+        '''Create a 6x4 board with a wall of obstacles in column 3'''
+        self.board = Board(6, 4, [(3, 0), (3, 1), (3, 2)])
+        self.toyrobot = ToyRobot(board=self.board)
+
+    def test_storage(self):
+        '''Ensure sparse obstacles use a set and dense obstacles a bitmap'''
+        sparse = Board(1000, 1000, [(5, 5), (999, 999)])
+        dense = Board(10, 10, [(x, 0) for x in range(10)])
+        self.assertIsNone(sparse._bitmap)  # pylint: disable=protected-access
+        self.assertIsNotNone(dense._bitmap)  # pylint: disable=protected-access
+        for board in (sparse, dense):
+            self.assertEqual(board.is_blocked((5, 5)), board is sparse)
+            self.assertEqual(board.is_blocked((9, 0)), board is dense)
+            self.assertTrue(board.is_blocked((-1, 0)))
+
+    def test_default(self):
+        '''Get the default board, ensure a given board is kept and the shared
+        empty board is used otherwise'''
+        self.assertIs(Board.default(self.board), self.board)
+        self.assertIs(Board.default(), ToyRobot().board)
+
+    def test_invalid(self):
+        '''Create boards which are empty or have obstacles off the plane'''
+        with self.assertRaises(ValueError):
+            Board(0, 5)
+        with self.assertRaises(ValueError):
+            Board(5, 5, [(5, 0)])
+
+    def test_place(self):
+        '''Place a robot on an obstacle, ensure it is ignored'''
+        self.assertFalse(self.toyrobot.place((3, 1), Direction.EAST))
+        self.assertTrue(self.toyrobot.place((5, 3), Direction.EAST))
+
+    def test_obstacle(self):
+        '''Move a robot into the wall, ensure it stops in front of it'''
+        self.toyrobot.place((0, 1), Direction.EAST)
+        self.toyrobot.move()
+        self.toyrobot.move()
+        self.assertFalse(self.toyrobot.move())
+        self.assertEqual(self.toyrobot.location, (2, 1))
+        self.toyrobot.left()
+        self.toyrobot.move()
+        self.toyrobot.move()
+        self.toyrobot.right()
+        self.assertEqual(self.toyrobot.advance(10), 3)
+        self.assertEqual(self.toyrobot.location, (5, 3))
+
+    def test_large(self):
+        '''Move a robot across a board with millions of cells'''
+        board = Board(3000, 2000, [(2999, 10)])
+        toyrobot = ToyRobot(board=board)
+        toyrobot.place((2990, 10), Direction.EAST)
+        self.assertEqual(toyrobot.advance(100), 8)
+        self.assertEqual(toyrobot.location, (2998, 10))
+        toyrobot.left()
+        self.assertEqual(toyrobot.advance(5000), 1989)
+        self.assertEqual(toyrobot.report(), ((2998, 1999), Direction.NORTH))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_fleet(self):
+        '''Move a fleet into the wall, ensure it matches the toy robot'''
+        fleet = RobotFleet(2, self.board)
+        fleet.place([(0, 1), (0, 3)], Direction.EAST)
+        self.assertEqual(list(fleet.advance(5)), [2, 5])
+        locations, _ = fleet.report()
+        self.assertEqual([tuple(l) for l in locations], [(2, 1), (5, 3)])
+
+
+    def test_backwards(self):
+        '''Advance by zero or negative steps with and without obstacles, ensure
+        nothing moves'''
+        for board in (Board.empty(5, 5), self.board):
+            toyrobot = ToyRobot(board=board)
+            toyrobot.place((2, 2), Direction.EAST)
+            for steps in (0, -2):
+                self.assertEqual(toyrobot.advance(steps), 0)
+                self.assertEqual(toyrobot.report(), ((2, 2), Direction.EAST))
+            if np is not None:
+                fleet = RobotFleet(1, board)
+                fleet.place((2, 2), Direction.EAST)
+                self.assertEqual(list(fleet.advance(-2)), [0])
+                self.assertEqual(tuple(fleet.report()[0][0]), (2, 2))
+
+class TestStateCodec(unittest.TestCase):
+    """
+    A class to test packing and unpacking the toy robot state.
+    """
+    def test_roundtrip(self):
+        '''Pack a robot and unpack it into another, ensure they match'''
+        toyrobot = ToyRobot()
+        toyrobot.place((3, 1), Direction.WEST)
+        unpacked = ToyRobot()
+        self.assertTrue(unpacked.unpack(toyrobot.pack()))
+        self.assertEqual(unpacked.report(), ((3, 1), Direction.WEST))
+
+    def test_board_independent(self):
+        '''Pack a robot on a large board, ensure it unpacks on a smaller one'''
+        toyrobot = ToyRobot(board=Board(100000, 100000))
+        toyrobot.place((99999, 4), Direction.SOUTH)
+        unpacked = ToyRobot(board=Board(100000, 5))
+        self.assertTrue(unpacked.unpack(toyrobot.pack()))
+        self.assertEqual(unpacked.report(), ((99999, 4), Direction.SOUTH))
+        self.assertFalse(ToyRobot().unpack(toyrobot.pack()))
+
+    def test_unplaced(self):
+        '''Pack an unplaced robot, ensure there is no state'''
+        self.assertIsNone(ToyRobot().pack())
+
+    def test_state_dict(self):
+        '''Ensure the state dictionary matches the json state'''
+        toyrobot = ToyRobot()
+        toyrobot.place((0, 4), Direction.NORTH)
+        self.assertEqual(toyrobot.state_dict(),
+                         {'location': {'x': 0, 'y': 4}, 'direction': 'NORTH'})
+        self.assertEqual(json.loads(toyrobot.dump_state()), toyrobot.state_dict())
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestFleet(unittest.TestCase):
+    """
+    A class to test the vectorised robot fleet against the toy robot.
+    """
+    def setUp(self):
+        '''Place a fleet of four robots at (1, 1) facing east'''
+        self.fleet = RobotFleet(4)
+        self.fleet.place((1, 1), Direction.EAST)
+
+    def test_unplaced(self):
+        '''Ensure commands are ignored by robots which were never placed'''
+        fleet = RobotFleet(2)
+        fleet.place((2, 2), Direction.NORTH, mask=[True, False])
+        fleet.move()
+        fleet.left()
+        locations, headings = fleet.report()
+        self.assertEqual(tuple(locations[0]), (2, 3))
+        self.assertEqual(Direction.from_integer(headings[0]), Direction.WEST)
+        self.assertEqual(headings[1], RobotFleet.UNPLACED)
+
+    def test_invalidplace(self):
+        '''Place robots out of bounds at (8, 16) ensure it is ignored'''
+        placed = self.fleet.place((8, 16), Direction.WEST)
+        self.assertFalse(placed.any())
+        locations, _ = self.fleet.report()
+        self.assertTrue((locations == (1, 1)).all())
+
+    def test_masked_move(self):
+        '''Move only half of the fleet, ensure the others stay in place'''
+        self.fleet.move(mask=[True, False, True, False])
+        locations, _ = self.fleet.report()
+        self.assertEqual([tuple(l) for l in locations], [(2, 1), (1, 1), (2, 1), (1, 1)])
+
+    def test_matches_toyrobot(self):
+        '''
+        Wander every robot in the fleet and a toy robot along the same path,
+        ensure they end up in the same state including at the walls
+        '''
+        toyrobot = ToyRobot()
+        toyrobot.place((1, 1), Direction.EAST)
+        for command in ['left', 'move', 'move', 'move', 'move', 'right', 'move',
+                        'right', 'right', 'move', 'left', 'move', 'move', 'move']:
+            getattr(self.fleet, command)()
+            getattr(toyrobot, command)()
+        locations, headings = self.fleet.report()
+        for location, heading in zip(locations, headings):
+            self.assertEqual(tuple(location), toyrobot.location)
+            self.assertEqual(Direction.from_integer(heading), toyrobot.direction)
+
+
 if __name__ == '__main__':
     unittest.main()
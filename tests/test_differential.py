@@ -0,0 +1,53 @@
+"""Module providing differential testing of the toy robot engines"""
+import unittest
+from itertools import islice
+from benchmarks.suite import MIX
+from tests.differential import ENGINES, cases, check, diverges, program_engine
+from toyrobot.fleet import np
+
+
+class TestDifferential(unittest.TestCase):
+    """
+    A class to test every engine against the reference semantics.
+    """
+    def test_engines(self):
+        '''Run random workloads through every engine, ensure none diverge'''
+        for name, engine in ENGINES.items():
+            if name == 'fleet' and np is None:
+                continue
+            workload = cases(1, sizes=[(5, 5), (7, 3), (1, 1)], length=200,
+                             mix=dict(MIX, MALFORMED=0.2), obstacles=0.1)
+            self.assertIsNone(check(engine, workload, 20000), name)
+
+    def test_malformed(self):
+        '''Check an engine which drops malformed places, ensure it is caught'''
+        def lenient(board, script):
+            return program_engine(board, [line for line in script
+                                          if not line.startswith('PLACE') or
+                                          line.count(',') == 2 and 'UP' not in line])
+        board, script = check(lenient, cases(2, mix=dict(MIX, MALFORMED=5)), 10 ** 4)
+        self.assertFalse(diverges(program_engine, board, script))
+        self.assertEqual(len(script), 1)
+
+    def test_reproducible(self):
+        '''Generate cases twice with one seed, ensure they match'''
+        first, second = islice(cases(3), 5), islice(cases(3), 5)
+        for (board, script), (other, again) in zip(first, second):
+            self.assertEqual((board.width, board.height), (other.width, other.height))
+            self.assertEqual(script, again)
+
+    def test_shrink(self):
+        '''Check an engine which drops every second LEFT, ensure the
+        divergence is shrunk to a minimal script'''
+        def faulty(board, script):
+            lefts = [index for index, line in enumerate(script) if line == 'LEFT']
+            return program_engine(board, [line for index, line in enumerate(script)
+                                          if index not in lefts[1::2]])
+        board, script = check(faulty, cases(5, length=300), 10 ** 5)
+        self.assertTrue(diverges(faulty, board, script))
+        self.assertEqual(script.count('LEFT'), 2)
+        self.assertLessEqual(len(script), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
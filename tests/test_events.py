@@ -0,0 +1,95 @@
+"""Module providing unit testing of the robot event bus"""
+import json
+import unittest
+from app import app
+from toyrobot.events import EventBus, EVENTS
+
+
+def parse(chunk: bytes) -> list:
+    '''Split a streamed chunk into (event, data) pairs'''
+    events = []
+    for message in chunk.decode().strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n') if ': ' in line)
+        events.append((fields.get('event'), fields.get('data')))
+    return events
+
+
+class TestEventBus(unittest.TestCase):
+    """
+    A class to test coalescing and streaming robot states.
+    """
+    def test_coalesce(self):
+        '''Publish many changes in one window, ensure only the latest is sent'''
+        bus = EventBus(window=60)
+        stream = bus.subscribe()
+        bus.publish('a', {'direction': 'NORTH'})
+        bus.publish('a', {'direction': 'EAST'})
+        bus.publish('b', {'direction': 'WEST'})
+        self.assertTrue(bus.flush())
+        self.assertFalse(bus.flush())
+        self.assertEqual(next(stream), b'retry: 60000\n\n')
+        events = parse(next(stream))
+        self.assertEqual(len(events), 1)
+        event, data = events[0]
+        self.assertEqual(event, 'states')
+        self.assertEqual(json.loads(data), {'a': {'direction': 'EAST'},
+                                            'b': {'direction': 'WEST'}})
+
+    def test_unsubscribed(self):
+        '''Publish without subscribers, ensure nothing is kept'''
+        bus = EventBus(window=60)
+        bus.publish('a', {})
+        self.assertFalse(bus.flush())
+        stream = bus.subscribe()
+        self.assertEqual(bus.subscribers, 1)
+        stream.close()
+        self.assertEqual(bus.subscribers, 0)
+
+    def test_dropped(self):
+        '''Fall behind the history, ensure the dropped batches are reported'''
+        bus = EventBus(window=60, history=2)
+        stream = bus.subscribe()
+        for index in range(5):
+            bus.publish('a', {'index': index})
+            bus.flush()
+        next(stream)
+        events = parse(next(stream))
+        self.assertEqual(events[0], ('dropped', '3'))
+        self.assertEqual([json.loads(data)['a']['index'] for _, data in events[1:]], [3, 4])
+        resumed = bus.subscribe(cursor=3, timeout=0)
+        next(resumed)
+        self.assertEqual(parse(next(resumed)), events[1:])
+
+    def test_endpoint(self):
+        '''Watch the event stream while another client moves, ensure it is sent'''
+        app.secret_key = 'testing'
+        response = app.test_client().get('/events', buffered=False)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        client = app.test_client()
+        client.post('/place?x=1&y=1&direction=north')
+        client.post('/move')
+        EVENTS.flush()
+        self.assertTrue(next(response.response).startswith(b'retry: '))
+        events = parse(next(response.response))
+        self.assertEqual(list(json.loads(events[-1][1]).values()),
+                         [{'location': {'x': 1, 'y': 2}, 'direction': 'NORTH'}])
+        response.close()
+
+
+    def test_unchanged(self):
+        '''Send commands which leave the robot as it was, ensure nothing is
+        published'''
+        app.secret_key = 'testing'
+        stream = EVENTS.subscribe()
+        client = app.test_client()
+        client.post('/place?x=0&y=4&direction=north')
+        EVENTS.flush()
+        for path in ('/move', '/commands'):
+            client.post(path, json=['MOVE'])
+            self.assertFalse(EVENTS.flush(), path)
+        client.post('/right')
+        self.assertTrue(EVENTS.flush())
+        stream.close()
+
+if __name__ == '__main__':
+    unittest.main()
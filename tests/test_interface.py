@@ -0,0 +1,125 @@
+"""Module providing unit testing of the command-line interfaces"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from interface import Cli, CliBatch, CliVisualiser, Renderer
+from toyrobot.core import Board
+
+
+class TestCli(unittest.TestCase):
+    """
+    A class to test parsing commands through the interactive interface.
+    """
+
+    def test_malformed(self):
+        '''Parse malformed PLACE commands, ensure each is reported and leaves the
+        toy robot where it was'''
+        cli = Cli()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for command in ('place 1,1,north', 'place 1,2', 'place 1,2,3,north',
+                            'place 1,1,up', 'place 2 2', 'report'):
+                cli.parse(command)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "'place 1,2' is not recognised. Type 'help' for help.",
+            "'place 1,2,3,north' is not recognised. Type 'help' for help.",
+            "'place 1,1,up' is not recognised. Type 'help' for help.",
+            "'place 2 2' is not recognised. Type 'help' for help.",
+            'Output: 1,1,NORTH',
+        ])
+
+
+class TestBatch(unittest.TestCase):
+    """
+    A class to test streaming commands through the batch interface.
+    """
+    SCRIPT = b'PLACE 0,0,NORTH\nMOVE\nREPORT\n\nRIGHT\nMOVE\nMOVE\nREPORT\nJUMP\nQUIT\nREPORT\n'
+    EXPECTED = b"Output: 0,1,NORTH\nOutput: 2,1,EAST\n'jump' is not recognised. " \
+               b"Type 'help' for help.\n"
+
+    def setUp(self):
+        '''Write the script to a temporary command file'''
+        descriptor, self.path = tempfile.mkstemp()
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(self.SCRIPT)
+
+    def tearDown(self):
+        '''Remove the temporary command file'''
+        os.remove(self.path)
+
+    def test_file(self):
+        '''Run the batch interface on a file, ensure the output matches'''
+        output = io.BytesIO()
+        CliBatch(output).run(self.path)
+        self.assertEqual(output.getvalue(), self.EXPECTED)
+
+    def test_malformed(self):
+        '''Run malformed lines mid-stream, ensure each is reported and the batch
+        continues'''
+        output = io.BytesIO()
+        CliBatch(output).execute([b'PLACE 1,1,NORTH\n', b'PLACE 1,2\n', b'PLACE a,b,NORTH\n',
+                                  b'MOVE \xff\n', b'PLACE 1,2,3,NORTH\n', b'PLACE 1,1,UP\n',
+                                  b'MOVE\n', b'REPORT\n'])
+        self.assertEqual(output.getvalue().decode().splitlines(), [
+            "'place 1,2' is not recognised. Type 'help' for help.",
+            "'place a,b,north' is not recognised. Type 'help' for help.",
+            "'MOVE \ufffd' is not recognised. Type 'help' for help.",
+            "'place 1,2,3,north' is not recognised. Type 'help' for help.",
+            "'place 1,1,up' is not recognised. Type 'help' for help.",
+            'Output: 1,2,NORTH',
+        ])
+
+    def test_empty(self):
+        '''Run the batch interface on an empty file, ensure nothing is output'''
+        with open(self.path, 'wb'):
+            pass
+        output = io.BytesIO()
+        CliBatch(output).run(self.path)
+        self.assertEqual(output.getvalue(), b'')
+
+
+class TestRenderer(unittest.TestCase):
+    """
+    A class to test redrawing the visualisation.
+    """
+    def visualiser(self, board, columns, rows):
+        '''Create a visualiser rendering into a string buffer'''
+        output = io.StringIO()
+        return CliVisualiser(board, Renderer(board, columns, rows, output)), output
+
+    def frame(self, visualiser, output, command):
+        '''Parse a command and display it, returning the escape codes written'''
+        output.seek(0)
+        output.truncate()
+        visualiser.parse(command)
+        visualiser.display()
+        return output.getvalue()
+
+    def test_incremental(self):
+        '''Display a few commands, ensure only the first draws the whole grid'''
+        visualiser, output = self.visualiser(Board(5, 5, [(4, 4)]), 5, 5)
+        first = self.frame(visualiser, output, 'place 0,0,north')
+        self.assertIn('. . . . # ', first)
+        self.assertIn('\033[9;1H^ ', first)
+        moved = self.frame(visualiser, output, 'move')
+        self.assertEqual(moved, '\033[9;1H. \033[7;1H^ \033[11;1H\033[J')
+        reported = self.frame(visualiser, output, 'report')
+        self.assertEqual(reported, '\033[11;1H\033[JOutput: 0,1,NORTH\n')
+
+    def test_viewport(self):
+        '''Move across a huge board, ensure frames stay within the window'''
+        visualiser, output = self.visualiser(Board(10000, 10000), 10, 5)
+        first = self.frame(visualiser, output, 'place 5000,5000,east')
+        self.assertEqual(visualiser.renderer.origin, (4995, 4998))
+        self.assertLess(len(first), 200)
+        for _ in range(4):
+            self.assertLess(len(self.frame(visualiser, output, 'move')), 40)
+        scrolled = self.frame(visualiser, output, 'move')
+        self.assertEqual(visualiser.renderer.origin, (5000, 4998))
+        self.assertLess(len(scrolled), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
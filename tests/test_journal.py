@@ -0,0 +1,103 @@
+"""Module providing unit testing of robot command journals"""
+import json
+import os
+import tempfile
+import unittest
+from toyrobot.core import ToyRobot, Direction, Board
+from toyrobot.journal import JournalRobot, ADVANCE, PAYLOADS, PLACE, state_at
+from toyrobot.program import compile_script
+from benchmarks.suite import random_commands
+
+
+class TestJournal(unittest.TestCase):
+    """
+    A class to test recording and reconstructing robot histories.
+    """
+    def setUp(self):
+        '''Create a directory for the journals'''
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, 'robot.journal')
+
+    def tearDown(self):
+        '''Remove the journals'''
+        self.directory.cleanup()
+
+    def test_state_at(self):
+        '''Record random commands, ensure every step is reconstructed'''
+        board = Board(6, 6, [(3, 3)])
+        history, reference = [], ToyRobot(board=board)
+        with JournalRobot(self.path, board, interval=16) as robot:
+            commands = [command for command in random_commands(600, 0, board)
+                        if command != 'REPORT']
+            for command in commands[:500]:
+                program = compile_script([command])
+                program.run(robot)
+                program.run(reference)
+                history.append(reference.report())
+        for step in (1, 15, 16, 17, 250, 500):
+            self.assertEqual(state_at(self.path, step, board).report(), history[step - 1])
+        self.assertIsNone(state_at(self.path, 0, board).location)
+        with self.assertRaises(ValueError):
+            state_at(self.path, 501, board)
+
+    def test_reopen(self):
+        '''Reopen a journal, ensure the robot continues where it stopped'''
+        with JournalRobot(self.path, interval=4) as robot:
+            robot.place((1, 1), Direction.NORTH)
+            robot.move()
+            robot.right()
+        with JournalRobot(self.path, interval=4) as robot:
+            self.assertEqual((robot.steps, robot.report()), (3, ((1, 2), Direction.EAST)))
+            robot.advance(3)
+            robot.unpack(ToyRobot().pack() or 0)
+        self.assertEqual(state_at(self.path, 4).report(), ((4, 2), Direction.EAST))
+        self.assertEqual(state_at(self.path, 5).report(), ((0, 0), Direction.NORTH))
+
+    def test_compact(self):
+        '''Record many moves, ensure the journal is far smaller than JSON'''
+        with JournalRobot(self.path) as robot:
+            robot.place((0, 0), Direction.EAST)
+            for _ in range(4096):
+                robot.move()
+            size = len(robot.dump_state()) * robot.steps
+        self.assertLess(os.path.getsize(self.path) * 10, size)
+
+    def test_torn(self):
+        '''Append part of a record as a crash would, ensure the journal is still
+        read and the partial record is cut off on reopen'''
+        with JournalRobot(self.path, interval=2) as robot:
+            robot.place((1, 1), Direction.NORTH)
+            robot.move()
+            robot.advance(1)
+        size = os.path.getsize(self.path)
+        with open(self.path, 'ab') as file:
+            file.write(bytes((PLACE,)) + b'\x02\x00')
+        self.assertEqual(state_at(self.path, 3).report(), ((1, 3), Direction.NORTH))
+        with JournalRobot(self.path, interval=2) as robot:
+            self.assertEqual((robot.steps, robot.report()), (3, ((1, 3), Direction.NORTH)))
+            self.assertEqual(os.path.getsize(self.path), size)
+            robot.move()
+        self.assertEqual(state_at(self.path, 4).report(), ((1, 4), Direction.NORTH))
+
+    def test_signed(self):
+        '''Pack a negative advance, ensure the payload round trips'''
+        layout = PAYLOADS[ADVANCE]
+        self.assertEqual(layout.unpack(layout.pack(-1)), (-1,))
+        self.assertEqual(layout.unpack(layout.pack(2 ** 40)), (2 ** 40,))
+
+    def test_invalid(self):
+        '''Reconstruct from a file that is not a journal, ensure it is refused'''
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump({}, file)
+        with self.assertRaises(ValueError):
+            state_at(self.path, 0)
+        with JournalRobot(os.path.join(self.directory.name, 'other.journal')) as robot:
+            robot.move()
+        with open(robot.path, 'ab') as file:
+            file.write(b'\xff')
+        with self.assertRaisesRegex(ValueError, 'unknown record'):
+            state_at(robot.path, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
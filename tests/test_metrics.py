@@ -0,0 +1,67 @@
+"""Module providing unit testing of the instrumentation layer"""
+import io
+import unittest
+from interface import Cli, CliBatch
+from toyrobot.core import ToyRobot, Direction
+from toyrobot.metrics import METRICS, BUCKETS
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    A class to test recording operations while instrumentation is enabled.
+    """
+    def setUp(self):
+        '''Enable instrumentation with no previous measurements'''
+        METRICS.reset()
+        METRICS.enable()
+
+    def tearDown(self):
+        '''Disable instrumentation so other tests run uninstrumented'''
+        METRICS.disable()
+        METRICS.reset()
+
+    def test_disabled(self):
+        '''Disable instrumentation, ensure the original methods are restored'''
+        self.assertTrue(hasattr(ToyRobot.move, '__wrapped__'))
+        METRICS.disable()
+        self.assertFalse(hasattr(ToyRobot.move, '__wrapped__'))
+        self.assertFalse(hasattr(Cli.parse, '__wrapped__'))
+        ToyRobot().move()
+        self.assertEqual(METRICS.counts, {})
+
+    def test_counts(self):
+        '''Move a robot into the wall, ensure the rejected move is counted'''
+        toyrobot = ToyRobot()
+        toyrobot.place((3, 0), Direction.EAST)
+        toyrobot.move()
+        toyrobot.move()
+        toyrobot.left()
+        self.assertEqual(METRICS.counts['robot.move'], 2)
+        self.assertEqual(METRICS.rejected['robot.move'], 1)
+        self.assertEqual(METRICS.counts['robot.left'], 1)
+        self.assertEqual(sum(METRICS.histograms['robot.move']), 2)
+        self.assertLessEqual(METRICS.percentile('robot.move', 0.5),
+                             METRICS.percentile('robot.move', 0.99))
+
+    def test_render(self):
+        '''Render the measurements, ensure every histogram is complete'''
+        ToyRobot().place((0, 0), Direction.NORTH)
+        lines = METRICS.render().splitlines()
+        buckets = [line for line in lines if line.startswith(
+            'toyrobot_operation_seconds_bucket{operation="robot.place"')]
+        self.assertEqual(len(buckets), BUCKETS + 1)
+        self.assertEqual(buckets[-1], 'toyrobot_operation_seconds_bucket'
+                                      '{operation="robot.place",le="+Inf"} 1')
+
+    def test_stats(self):
+        '''Send the stats command, ensure the interface operations are listed'''
+        cli = CliBatch(io.BytesIO())
+        cli.parse('place 1,1,north')
+        cli.parse('stats')
+        output = cli.output.getvalue().decode()
+        self.assertIn('cli.parse', output)
+        self.assertIn('robot.place', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
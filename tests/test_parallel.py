@@ -0,0 +1,38 @@
+"""Module providing unit testing of running scripts in parallel"""
+import io
+import unittest
+from interface import CliBatch
+from parallel import ParallelRunner
+from toyrobot.core import Board
+from benchmarks.suite import random_commands
+
+
+class TestParallel(unittest.TestCase):
+    """
+    A class to test running scripts across a pool of processes.
+    """
+    def setUp(self):
+        '''Generate random scripts and their serial outputs'''
+        self.board = Board(6, 6, [(2, 2)])
+        self.scripts = ['\n'.join(random_commands(50, seed, self.board)) + '\njump'
+                        for seed in range(40)]
+        self.expected = []
+        for script in self.scripts:
+            cli = CliBatch(io.BytesIO(), self.board)
+            cli.execute(script.encode().splitlines())
+            self.expected.append(cli.output.getvalue())
+
+    def test_map(self):
+        '''Run scripts in parallel, ensure outputs match serial runs in order'''
+        runner = ParallelRunner(2, board=self.board)
+        self.assertEqual(list(runner.map(self.scripts)), self.expected)
+
+    def test_as_completed(self):
+        '''Run scripts as they complete, ensure every output is yielded once'''
+        runner = ParallelRunner(2, chunksize=3, board=self.board)
+        self.assertEqual(sorted(runner.as_completed(self.scripts)),
+                         list(enumerate(self.expected)))
+
+
+if __name__ == '__main__':
+    unittest.main()
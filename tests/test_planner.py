@@ -0,0 +1,64 @@
+"""Module providing unit testing of route planning"""
+import unittest
+from toyrobot.core import ToyRobot, Direction, Board
+from toyrobot.planner import Planner
+from toyrobot.program import compile_script
+
+
+class TestPlanner(unittest.TestCase):
+    """
+    A class to test planning routes between toy robot states.
+    """
+    def follow(self, board, location, direction, route):
+        '''Run a route from a start state, returning the final report'''
+        toyrobot = ToyRobot(board=board)
+        toyrobot.place(location, direction)
+        compile_script(route).run(toyrobot)
+        return toyrobot.report()
+
+    def test_shortest(self):
+        '''Plan a route on an empty board, ensure it is shortest and arrives'''
+        planner = Planner()
+        route = planner.plan((0, 0), Direction.NORTH, (2, 3), Direction.SOUTH)
+        self.assertEqual(len(route), 7)
+        self.assertEqual(self.follow(planner.board, (0, 0), Direction.NORTH, route),
+                         ((2, 3), Direction.SOUTH))
+        self.assertEqual(planner.plan((1, 1), Direction.EAST, (1, 1), Direction.EAST), [])
+
+    def test_obstacles(self):
+        '''Plan a route around a wall, ensure it avoids every obstacle'''
+        board = Board(5, 5, [(1, 0), (1, 1), (1, 2), (1, 3)])
+        route = Planner(board).plan((0, 0), Direction.NORTH, (2, 0), Direction.SOUTH)
+        self.assertEqual(route, ['MOVE'] * 4 + ['RIGHT'] + ['MOVE'] * 2 + ['RIGHT'] + ['MOVE'] * 4)
+        self.assertEqual(self.follow(board, (0, 0), Direction.NORTH, route),
+                         ((2, 0), Direction.SOUTH))
+
+    def test_unreachable(self):
+        '''Plan routes to enclosed and blocked goals, ensure they are refused'''
+        planner = Planner(Board(3, 3, [(1, 0), (0, 1)]))
+        self.assertIsNone(planner.plan((2, 2), Direction.NORTH, (0, 0), Direction.EAST))
+        with self.assertRaises(ValueError):
+            planner.plan((2, 2), Direction.NORTH, (1, 0), Direction.EAST)
+
+    def test_cache(self):
+        '''Plan many routes to one goal, ensure the distances are searched once'''
+        planner = Planner(capacity=1)
+        field = planner.distances((4, 4), Direction.NORTH)
+        for x in range(5):
+            planner.plan((x, 0), Direction.WEST, (4, 4), Direction.NORTH)
+        self.assertIs(planner.distances((4, 4), Direction.NORTH), field)
+        planner.distances((0, 0), Direction.NORTH)
+        self.assertIsNot(planner.distances((4, 4), Direction.NORTH), field)
+
+
+    def test_memory(self):
+        '''Plan to many goals with a small memory limit, ensure only the
+        distances fitting in it are kept'''
+        planner = Planner(Board.empty(50, 50), memory=3 * 50 * 50 * 4 * 4)
+        fields = [planner.distances((x, 0), Direction.NORTH) for x in range(5)]
+        self.assertEqual(fields[0].itemsize, 4)
+        self.assertIsNot(planner.distances((0, 0), Direction.NORTH), fields[0])
+        self.assertIs(planner.distances((4, 0), Direction.NORTH), fields[4])
+
+if __name__ == '__main__':
+    unittest.main()
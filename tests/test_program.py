@@ -0,0 +1,125 @@
+"""Module providing unit testing of compiled command programs"""
+import unittest
+from toyrobot.core import ToyRobot, Direction, Board
+from toyrobot.fleet import RobotFleet, np
+from toyrobot.program import compile_script, OP_MOVE, OP_TURN, OP_PLACE, OP_REPORT
+
+
+class TestCompile(unittest.TestCase):
+    """
+    A class to test compiling command scripts into programs.
+    """
+    def test_fold_moves(self):
+        '''Compile a run of moves, ensure it collapses into one jump'''
+        program = compile_script('MOVE\nMOVE\nMOVE\nREPORT\nMOVE')
+        self.assertEqual(list(program.instructions()),
+                         [(OP_MOVE, (3,)), (OP_REPORT, ()), (OP_MOVE, (1,))])
+
+    def test_fold_turns(self):
+        '''Compile runs of rotations, ensure they fold into one rotation'''
+        program = compile_script(['LEFT', 'LEFT', 'LEFT', 'MOVE', 'LEFT', 'RIGHT'])
+        self.assertEqual(list(program.instructions()),
+                         [(OP_TURN, (1,)), (OP_MOVE, (1,))])
+
+    def test_cancelled_turn(self):
+        '''Compile a cancelled rotation, ensure the moves around it merge'''
+        program = compile_script(['PLACE 1,1,NORTH', 'MOVE', 'RIGHT', 'LEFT', 'MOVE'])
+        self.assertEqual(list(program.instructions()),
+                         [(OP_PLACE, (1, 1, 0)), (OP_MOVE, (2,))])
+
+    def test_spaced_place(self):
+        '''Compile a place with spaced arguments, ensure it is parsed'''
+        program = compile_script(['PLACE 1 2 EAST', 'HELP'])
+        self.assertEqual(list(program.instructions()), [(OP_PLACE, (1, 2, 1))])
+
+    def test_malformed_place(self):
+        '''Compile malformed places, ensure they raise an error as the command-line
+        interface reports them'''
+        for line in ('PLACE 1,1,UP', 'PLACE 1,2', 'PLACE 1,2,3,NORTH', 'PLACE a,b,NORTH',
+                     'PLACE'):
+            with self.assertRaises(ValueError):
+                compile_script([line])
+
+    def test_invalid(self):
+        '''Compile an unknown command, ensure it raises an error'''
+        with self.assertRaises(ValueError):
+            compile_script('JUMP')
+
+
+class TestRun(unittest.TestCase):
+    """
+    A class to test running compiled programs against toy robots.
+    """
+    SCRIPT = ['MOVE', 'PLACE 2,2,EAST', 'REPORT', 'MOVE', 'MOVE', 'MOVE', 'MOVE',
+              'LEFT', 'LEFT', 'LEFT', 'MOVE', 'MOVE', 'MOVE', 'REPORT', 'RIGHT',
+              'MOVE', 'REPORT']
+
+    def test_matches_toyrobot(self):
+        '''Run a program and step a toy robot, ensure the reports match'''
+        toyrobot, expected = ToyRobot(), []
+        for command in self.SCRIPT:
+            command, *arguments = command.lower().split(' ')
+            if command == 'place':
+                x, y, d = arguments[0].split(',')
+                toyrobot.place((int(x), int(y)), Direction[d.upper()])
+            elif command == 'report':
+                expected.append(toyrobot.report())
+            else:
+                getattr(toyrobot, command)()
+        reports = compile_script(self.SCRIPT).run(ToyRobot())
+        self.assertEqual(reports, expected)
+        self.assertEqual(reports[-1], ((3, 0), Direction.WEST))
+
+    def test_unplaced(self):
+        '''Run a program on an unplaced robot, ensure nothing is reported'''
+        self.assertEqual(compile_script('MOVE\nLEFT\nREPORT').run(ToyRobot()), [])
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_fleet(self):
+        '''Run a program against a batch of start states at once'''
+        fleet = RobotFleet(3)
+        fleet.place([(0, 0), (4, 4), (2, 3)], [0, 1, 2])
+        program = compile_script(['MOVE', 'MOVE', 'RIGHT', 'MOVE', 'REPORT'])
+        locations, headings = program.run_fleet(fleet)[0]
+        for start, location, heading in zip([(0, 0), (4, 4), (2, 3)], locations, headings):
+            toyrobot = ToyRobot()
+            toyrobot.place(start, Direction.from_integer(heading - 1))
+            self.assertEqual(program.run(toyrobot), [(tuple(location),
+                                                      Direction.from_integer(heading))])
+
+
+class TestRepeat(unittest.TestCase):
+    """
+    A class to test fast-forwarding repeated programs.
+    """
+    PATROL = ['MOVE', 'MOVE', 'MOVE', 'RIGHT', 'MOVE', 'LEFT', 'LEFT', 'MOVE', 'MOVE']
+
+    def test_matches_stepping(self):
+        '''Repeat a patrol, ensure it matches running it one at a time'''
+        program = compile_script(self.PATROL)
+        stepped = ToyRobot()
+        stepped.place((0, 0), Direction.NORTH)
+        for times in range(1, 40):
+            program.run(stepped)
+            toyrobot = ToyRobot()
+            toyrobot.place((0, 0), Direction.NORTH)
+            program.repeat(toyrobot, times)
+            self.assertEqual(toyrobot.report(), stepped.report())
+
+    def test_billion(self):
+        '''Repeat a patrol a billion times, ensure only a cycle is executed'''
+        toyrobot = ToyRobot(board=Board(50, 50, [(10, 10)]))
+        toyrobot.place((10, 0), Direction.NORTH)
+        executed = compile_script(self.PATROL).repeat(toyrobot, 10 ** 9)
+        self.assertLess(executed, 10000)
+        self.assertIsNotNone(toyrobot.location)
+
+    def test_unplaced(self):
+        '''Repeat a program on an unplaced robot, ensure nothing happens'''
+        toyrobot = ToyRobot()
+        self.assertEqual(compile_script(self.PATROL).repeat(toyrobot, 10 ** 9), 1)
+        self.assertIsNone(toyrobot.location)
+
+
+if __name__ == '__main__':
+    unittest.main()
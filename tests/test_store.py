@@ -0,0 +1,102 @@
+"""Module providing unit testing of the robot state stores"""
+import os
+import tempfile
+import unittest
+from toyrobot.store import StateStore, MemoryStore, SqliteStore, open_store
+
+
+class TestMemoryStore(unittest.TestCase):
+    """
+    A class to test the in-process least recently used store.
+    """
+    def test_roundtrip(self):
+        '''Store a state, ensure it is returned and can be deleted'''
+        store = MemoryStore()
+        store.set('a', 42)
+        self.assertEqual(store.get('a'), 42)
+        store.delete('a')
+        self.assertIsNone(store.get('a'))
+
+    def test_eviction(self):
+        '''Overfill the store, ensure the least recently used robot is evicted'''
+        store = MemoryStore(capacity=2)
+        store.set('a', 1)
+        store.set('b', 2)
+        store.get('a')
+        store.set('c', 3)
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('a'), 1)
+
+
+class TestStateStore(unittest.TestCase):
+    """
+    A class to test the base class of state stores.
+    """
+    def test_incomplete(self):
+        '''Create a backend missing a method, ensure it is refused'''
+        class Incomplete(StateStore):  # pylint: disable=abstract-method
+            '''Store which cannot delete robots'''
+            def get(self, robot_id):
+                return None
+
+            def set(self, robot_id, packed):
+                pass
+        with self.assertRaises(TypeError):
+            Incomplete()  # pylint: disable=abstract-class-instantiated
+
+
+class TestSqliteStore(unittest.TestCase):
+    """
+    A class to test the SQLite backed store.
+    """
+    def setUp(self):
+        '''Create a temporary database directory'''
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, 'robots.db')
+
+    def tearDown(self):
+        '''Remove the temporary database directory'''
+        self.directory.cleanup()
+
+    def test_shared(self):
+        '''Store a state through one connection, ensure another can read it'''
+        writer, reader = SqliteStore(self.path), SqliteStore(self.path)
+        writer.set('a', 1 << 40)
+        writer.set('a', 7)
+        self.assertEqual(reader.get('a'), 7)
+        reader.delete('a')
+        self.assertIsNone(writer.get('a'))
+        writer.close()
+        reader.close()
+
+    def test_open(self):
+        '''Open stores by URL, ensure the right backend is used'''
+        self.assertEqual(open_store(f'sqlite://{self.path}').path, self.path)
+        self.assertEqual(open_store('memory://?capacity=5').capacity, 5)
+        for url in ('redis://localhost', 'sqlite://'):
+            with self.assertRaises(ValueError):
+                open_store(url)
+
+    def test_relative(self):
+        '''Open databases by relative URLs, ensure they are the files an
+        absolute URL opens'''
+        os.mkdir(os.path.join(self.directory.name, 'data'))
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            relative = open_store('sqlite://robots.db')
+            nested = open_store('sqlite://data/robots.db')
+        finally:
+            os.chdir(cwd)
+        relative.set('a', 3)
+        nested.set('a', 4)
+        absolute = open_store(f'sqlite://{self.path}')
+        self.assertEqual((relative.path, nested.path), ('robots.db', 'data/robots.db'))
+        self.assertEqual(absolute.get('a'), 3)
+        for store in (relative, nested, absolute):
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Module providing unit testing of multi-robot worlds"""
+import unittest
+from toyrobot.core import Direction, Board
+from toyrobot.world import World
+
+
+class TestWorld(unittest.TestCase):
+    """
+    A class to test collisions between robots sharing a world.
+    """
+    def setUp(self):
+        '''Create a world with one robot at (2, 2) facing north'''
+        self.world = World()
+        self.blocker = self.world.spawn()
+        self.blocker.place((2, 2), Direction.NORTH)
+        self.toyrobot = self.world.spawn()
+
+    def test_place(self):
+        '''Place a robot onto another robot, ensure it is ignored'''
+        self.assertFalse(self.toyrobot.place((2, 2), Direction.EAST))
+        self.assertIsNone(self.toyrobot.location)
+        self.assertTrue(self.toyrobot.place((1, 2), Direction.EAST))
+        self.assertIs(self.world.robot_at((1, 2)), self.toyrobot)
+
+    def test_replace(self):
+        '''Place a robot again, ensure its old cell is freed'''
+        self.toyrobot.place((0, 0), Direction.EAST)
+        self.toyrobot.place((0, 0), Direction.WEST)
+        self.toyrobot.place((4, 4), Direction.WEST)
+        self.assertIsNone(self.world.robot_at((0, 0)))
+        self.assertIs(self.world.robot_at((4, 4)), self.toyrobot)
+
+    def test_collision(self):
+        '''Move a robot into another robot, ensure it stops in front of it'''
+        self.toyrobot.place((0, 2), Direction.EAST)
+        self.assertTrue(self.toyrobot.move())
+        self.assertFalse(self.toyrobot.move())
+        self.assertEqual(self.toyrobot.location, (1, 2))
+        self.blocker.move()
+        self.assertTrue(self.toyrobot.move())
+        self.assertEqual(self.toyrobot.location, (2, 2))
+
+    def test_advance(self):
+        '''Advance a robot towards another robot, ensure it does not pass it'''
+        self.toyrobot.place((2, 0), Direction.NORTH)
+        self.assertEqual(self.toyrobot.advance(4), 1)
+        self.assertEqual(self.toyrobot.location, (2, 1))
+
+    def test_remove(self):
+        '''Remove a robot from the world, ensure its cell is freed'''
+        self.world.remove(self.blocker)
+        self.toyrobot.place((2, 1), Direction.NORTH)
+        self.assertTrue(self.toyrobot.move())
+        self.assertEqual(len(self.world), 1)
+
+    def test_crowded(self):
+        '''Fill a large world with robots, ensure collisions are still found'''
+        world = World(Board(1000, 1000))
+        for x in range(1000):
+            world.spawn().place((x, 1), Direction.SOUTH)
+        toyrobot = world.spawn()
+        toyrobot.place((500, 0), Direction.NORTH)
+        self.assertFalse(toyrobot.move())
+        self.assertTrue(world.robots[0].move())
+        self.assertFalse(world.robots[500].move())
+
+
+if __name__ == '__main__':
+    unittest.main()
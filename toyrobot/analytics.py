@@ -0,0 +1,152 @@
+"""Reachability and coverage analytics of command scripts.
+
+Instead of running a toy robot once for every start state, the whole start
+state space is pushed through a script at once. The script is held as a
+mapping from each start state to the current state, using the encoding of
+TransitionTable, and every command is composed onto that mapping with a
+single vectorised lookup. The cost is one array operation per robot step
+rather than one robot per start state, so whole large boards are analysed in
+seconds.
+"""
+
+from toyrobot.core import Board, DIRECTIONS
+from toyrobot.fleet import np
+from toyrobot.program import Program, compile_script, OP_MOVE, OP_TURN, OP_PLACE
+
+
+class Analysis():
+    """End states and visited cells of a script run from every start state.
+
+    Only placed start states are analysed, as a robot which is not placed
+    ignores every command until the first PLACE.
+
+    Attributes:
+        board (Board): The plane the script was run on
+        starts (numpy.ndarray):
+            Encoded start states, every open location with every heading
+        final (numpy.ndarray):
+            Encoded final state of the robot started from each start state
+        visits (numpy.ndarray):
+            Array of shape (height, width) counting the times a MOVE or
+            PLACE command brought any robot to each cell, start cells are
+            not counted
+        endings (numpy.ndarray):
+            Array of shape (height, width) counting the robots finishing in
+            each cell
+
+    Args:
+        board (Board): The plane the script was run on
+        starts (numpy.ndarray): Encoded start states
+        final (numpy.ndarray): Encoded final states
+        visits (numpy.ndarray): Arrivals counted by cell index
+    """
+
+    def __init__(self, board: Board, starts, final, visits) -> None:
+        """Initialise the analysis from the final mapping and arrivals.
+
+        Args:
+            board (Board): The plane the script was run on
+            starts (numpy.ndarray): Encoded start states
+            final (numpy.ndarray): Encoded final states
+            visits (numpy.ndarray): Arrivals counted by cell index
+        """
+        shape = (board.height, board.width)
+        self.board = board
+        self.starts = starts
+        self.final = final
+        self.visits = visits.reshape(shape)
+        self.endings = np.reshape(np.bincount(final >> 2, minlength=board.size), shape)
+
+    def coverage(self) -> float:
+        """Get the fraction of open cells a command brought a robot to, from
+        any start state.
+
+        Returns:
+            float: Arrived at open cells over all open cells
+        """
+        return np.count_nonzero(self.visits) / (self.board.size - self.board.obstacles)
+
+    def final_state(self, location: tuple, direction) -> tuple:
+        """Look up the final state of the robot started from a given state.
+
+        Args:
+            location (tuple[int, int]): Start location
+            direction (Direction): Start direction
+
+        Returns:
+            tuple[tuple[int, int], Direction]:
+                The final location and direction, or None if the start is not
+                an open location
+        """
+        table = self.board.transitions
+        if self.board.is_blocked(location):
+            return None
+        index = np.searchsorted(self.starts, table.encode(location, direction))
+        return table.decode(int(self.final[index]))
+
+
+def _open_states(board: Board, dtype):
+    """Encode every open location of a board with every heading."""
+    cells = np.arange(board.size, dtype=dtype)
+    if board.obstacles:
+        cells = np.setdiff1d(cells, np.array(board.obstacle_cells(), dtype=dtype))
+    return (cells[:, None] * 4 + np.arange(4, dtype=dtype)).ravel()
+
+
+def _move_table(board: Board, dtype):
+    """Compute the state after a MOVE command for every state at once."""
+    width, height = board.width, board.height
+    states = np.arange(board.size * 4, dtype=dtype)
+    step = np.array([direction.value for direction in DIRECTIONS], dtype=dtype)[states & 3]
+    x, y = (states >> 2) % width + step[:, 0], (states >> 2) // width + step[:, 1]
+    open_cells = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    if board.obstacles:
+        blocked = np.zeros(board.size, dtype=bool)
+        blocked[np.array(board.obstacle_cells(), dtype=np.int64)] = True
+        open_cells[open_cells] = ~blocked[y[open_cells] * width + x[open_cells]]
+    return np.where(open_cells, states + (step[:, 1] * width + step[:, 0]) * 4, states)
+
+
+def analyse(script, board: Board = None) -> Analysis:
+    """Run a script from every start state on a board at once.
+
+    Args:
+        script (Program | str | Iterable[str]):
+            A compiled program, or a script compiled with compile_script
+        board (Board):
+            Optional plane, an empty ToyRobot.WIDTH by ToyRobot.HEIGHT plane
+            is used by default.
+
+    Raises:
+        ImportError: If numpy is not installed
+        ValueError: If the script holds an unrecognised command
+
+    Returns:
+        Analysis: The end states and visited cells
+    """
+    if np is None:
+        raise ImportError('analyse requires numpy to be installed')
+    board = Board.default(board)
+    program = script if isinstance(script, Program) else compile_script(script)
+    dtype = np.int32 if board.size * 4 < 1 << 31 else np.int64
+    move = _move_table(board, dtype)
+
+    starts = _open_states(board, dtype)
+    states = starts.copy()
+    visits = np.zeros(board.size, dtype=np.int64)
+    for opcode, operands in program.instructions():
+        if opcode == OP_MOVE:
+            for _ in range(operands[0]):
+                moved = move[states]
+                arrived = moved[moved != states]
+                if not arrived.size:
+                    break
+                visits += np.bincount(arrived >> 2, minlength=board.size)
+                states = moved
+        elif opcode == OP_TURN:
+            states = states - (states & 3) + ((states + operands[0]) & 3)
+        elif opcode == OP_PLACE and not board.is_blocked(operands[:2]):
+            x, y, heading = operands
+            states = np.full_like(states, (y * board.width + x) * 4 + heading)
+            visits[y * board.width + x] += len(states)
+    return Analysis(board, starts, states, visits)
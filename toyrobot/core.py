@@ -1,10 +1,15 @@
 """Core module for the toy robot demonstration.
 
 This module is commonly used by interfaces to provide the core functionality.
+It only imports light standard library modules so short-lived processes start
+quickly. json is imported by the JSON state codec when it is first used, and
+the numpy backed RobotFleet lives in toyrobot.fleet.
 """
 
+from array import array
+from collections.abc import Sequence
 from enum import Enum
-import json
+from functools import lru_cache
 
 
 class Direction(Enum):
@@ -24,9 +29,7 @@ class Direction(Enum):
         Returns:
             Direction: Direction after being rotated
         """
-        members = list(self.__class__)
-        index = members.index(self) + 1
-        return members[index % len(members)]
+        return DIRECTIONS[(HEADINGS[self] + 1) % 4]
 
     def counterclockwise(self):
         """Rotate the given direction by 90 degrees counter-clockwise.
@@ -34,9 +37,7 @@ class Direction(Enum):
         Returns:
             Direction: Direction after being rotated
         """
-        members = list(self.__class__)
-        index = members.index(self) - 1
-        return members[index % len(members)]
+        return DIRECTIONS[(HEADINGS[self] - 1) % 4]
 
     @staticmethod
     def from_integer(index: int):
@@ -45,8 +46,7 @@ class Direction(Enum):
         Returns:
             Direction: Direction of index given
         """
-        members = list(Direction)
-        return members[index % len(members)]
+        return DIRECTIONS[index % 4]
 
     def __str__(self) -> str:
         """Plain string representation of the object for printing.
@@ -57,6 +57,254 @@ class Direction(Enum):
         return self.name
 
 
+DIRECTIONS = tuple(Direction)
+'''Every direction ordered by its serialisable integer index'''
+HEADINGS = {direction: index for index, direction in enumerate(DIRECTIONS)}
+'''Serialisable integer index of every direction'''
+PACKED_BITS = 32
+'''Number of bits used for each coordinate of a packed robot state'''
+PACKED_MASK = (1 << PACKED_BITS) - 1
+'''Mask extracting a single coordinate of a packed robot state'''
+
+
+class Board():
+    """Rectangular plane on which toy robots sit, with optional obstacles.
+
+    Obstacles are stored as a hashed set of cell indices while they are
+    sparse, and as a bitmap with one bit per cell once they are dense enough
+    that the bitmap is smaller. Either way, checking a cell is O(1).
+
+    Attributes:
+        width (int): Number of columns on the plane
+        height (int): Number of rows on the plane
+        obstacles (int): Number of blocked cells on the plane
+        DENSITY (float):
+            Fraction of blocked cells above which a bitmap is used. A set costs
+            roughly 64 bytes per obstacle where a bitmap costs 1/8 of a byte
+            per cell.
+
+    Args:
+        width (int): Number of columns on the plane
+        height (int): Number of rows on the plane
+        obstacles (Iterable[tuple[int, int]]): Locations of blocked cells
+    """
+    DENSITY: float = 1 / 512
+
+    def __init__(self, width: int = 5, height: int = 5, obstacles=()) -> None:
+        """Initialise the plane and index its obstacles.
+
+        Args:
+            width (int): Number of columns on the plane
+            height (int): Number of rows on the plane
+            obstacles (Iterable[tuple[int, int]]): Locations of blocked cells
+
+        Raises:
+            ValueError: If the plane is empty or an obstacle is off the plane
+        """
+        if width < 1 or height < 1:
+            raise ValueError('The plane must have at least one cell')
+        self.width, self.height = width, height
+        cells = set()
+        for x, y in obstacles:
+            if not 0 <= x < width or not 0 <= y < height:
+                raise ValueError(f'Obstacle ({x}, {y}) is off the plane')
+            cells.add(y * width + x)
+        self.obstacles = len(cells)
+        self._bitmap = None
+        self._blocked = frozenset(cells)
+        if len(cells) > width * height * self.DENSITY:
+            self._bitmap = bytearray((width * height + 7) // 8)
+            for cell in cells:
+                self._bitmap[cell >> 3] |= 1 << (cell & 7)
+            self._blocked = None
+        self._transitions = None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def empty(width: int = 5, height: int = 5) -> 'Board':
+        """Get the shared obstacle-free plane of the given size.
+
+        Args:
+            width (int): Number of columns on the plane
+            height (int): Number of rows on the plane
+
+        Returns:
+            Board: The shared plane
+        """
+        return Board(width, height)
+
+    @staticmethod
+    def default(board: 'Board' = None) -> 'Board':
+        """Get a plane, or the shared empty ToyRobot.WIDTH by ToyRobot.HEIGHT
+        plane when none is given.
+
+        Args:
+            board (Board): Optional plane
+
+        Returns:
+            Board: The given plane, or the default empty plane
+        """
+        return board if board is not None else Board.empty(ToyRobot.WIDTH, ToyRobot.HEIGHT)
+
+    @property
+    def size(self) -> int:
+        """Number of cells on the plane."""
+        return self.width * self.height
+
+    @property
+    def transitions(self) -> 'TransitionTable':
+        """Transition table for the plane, built the first time it is used."""
+        if self._transitions is None:
+            self._transitions = TransitionTable(self)
+        return self._transitions
+
+    def is_obstacle(self, cell: int) -> bool:
+        """Check if a cell index on the plane is blocked by an obstacle.
+
+        Args:
+            cell (int): Cell index, y * width + x
+
+        Returns:
+            bool: If the cell is blocked
+        """
+        if self._bitmap is not None:
+            return bool(self._bitmap[cell >> 3] >> (cell & 7) & 1)
+        return cell in self._blocked
+
+    def is_blocked(self, location: tuple) -> bool:
+        """Check if a location is off the plane or blocked by an obstacle.
+
+        Args:
+            location (tuple[int, int]): Location to check
+
+        Returns:
+            bool: If a robot may not stand at the location
+        """
+        x, y = location
+        if not 0 <= x < self.width or not 0 <= y < self.height:
+            return True
+        return self.obstacles > 0 and self.is_obstacle(y * self.width + x)
+
+    def obstacle_cells(self) -> list:
+        """List the cell indices of every obstacle on the plane.
+
+        Returns:
+            list[int]: Sorted cell indices of every blocked cell
+        """
+        if self._bitmap is None:
+            return sorted(self._blocked)
+        return [cell for cell in range(self.size) if self.is_obstacle(cell)]
+
+
+class _Computed(Sequence):
+    """Read-only sequence whose items are computed on access, used in place of
+    precomputed arrays that would be too large to hold in memory.
+
+    Args:
+        function (Callable[[int], object]): Function computing each item
+        length (int): Number of items in the sequence
+    """
+
+    def __init__(self, function, length: int) -> None:
+        self._function, self._length = function, length
+
+    def __getitem__(self, index: int):
+        return self._function(index)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class TransitionTable():
+    """State transitions for every state on a board.
+
+    A robot state is encoded as a single integer, ((y * width) + x) * 4 plus
+    the heading index, and each command is a lookup into an array of the next
+    state for every possible state. Moves off the plane or into an obstacle
+    map a state to itself. Boards larger than LIMIT cells compute transitions
+    on access instead of holding the arrays in memory.
+
+    Attributes:
+        width (int): Number of columns on the plane
+        height (int): Number of rows on the plane
+        move (Sequence[int]): Next state after a MOVE command
+        left (Sequence[int]): Next state after a LEFT command
+        right (Sequence[int]): Next state after a RIGHT command
+        cells (Sequence[tuple[int, int]]):
+            Location tuple for every cell, indexed by state // 4
+        LIMIT (int):
+            Largest number of cells for which transitions are precomputed.
+
+    Args:
+        board (Board): The board to build transitions for
+    """
+    LIMIT: int = 1 << 16
+
+    def __init__(self, board: Board) -> None:
+        """Build the transition arrays for every state on the board.
+
+        Args:
+            board (Board): The board to build transitions for
+        """
+        self.board = board
+        self.width, self.height = board.width, board.height
+        size = board.size * 4
+        if board.size > self.LIMIT:
+            self.cells = _Computed(lambda cell: (cell % self.width, cell // self.width),
+                                   board.size)
+            self.move = _Computed(self._move, size)
+            self.left = _Computed(lambda state: state - state % 4 + (state - 1) % 4, size)
+            self.right = _Computed(lambda state: state - state % 4 + (state + 1) % 4, size)
+            return
+        self.cells = tuple((x, y) for y in range(self.height) for x in range(self.width))
+        self.move = array('q', range(size))
+        self.left = array('q', range(size))
+        self.right = array('q', range(size))
+        for state in self.move:
+            heading = state & 3
+            self.left[state] = state - heading + (heading - 1) % 4
+            self.right[state] = state - heading + (heading + 1) % 4
+            self.move[state] = self._move(state)
+
+    def _move(self, state: int) -> int:
+        """Compute the state after a MOVE command.
+
+        Args:
+            state (int): An encoded state
+
+        Returns:
+            int: The encoded state after moving
+        """
+        cell = state >> 2
+        dx, dy = DIRECTIONS[state & 3].value
+        if self.board.is_blocked((cell % self.width + dx, cell // self.width + dy)):
+            return state
+        return state + (dy * self.width + dx) * 4
+
+    def encode(self, location: tuple, direction: Direction) -> int:
+        """Encode a location and direction as a state.
+
+        Args:
+            location (tuple[int, int]): Location on the plane
+            direction (Direction): Direction the robot is facing
+
+        Returns:
+            int: The encoded state
+        """
+        return (location[1] * self.width + location[0]) * 4 + HEADINGS[direction]
+
+    def decode(self, state: int) -> tuple:
+        """Decode a state into a location and direction.
+
+        Args:
+            state (int): An encoded state
+
+        Returns:
+            tuple[tuple[int, int], Direction]: The location and direction
+        """
+        return self.cells[state >> 2], DIRECTIONS[state & 3]
+
+
 class ToyRobot():
     """Main toy robot class that handes the functionality.
 
@@ -66,49 +314,115 @@ class ToyRobot():
             corner as the origin.
         direction (Direction): 
             Current cardinal direction the toy robot is facing.
+        board (Board):
+            The plane on which the toy robot sits.
         WIDTH (int):
-            Constant defining the maximum x value of the plane on which the toy
-            robot sits.
+            Constant defining the maximum x value of the default plane on
+            which the toy robot sits.
         HEIGHT (int):
-            Constant defining the maximum y value of the plane on which the toy
-            robot sits.
-            
+            Constant defining the maximum y value of the default plane on
+            which the toy robot sits.
+        _state (int):
+            Current location and direction encoded as a transition table
+            state, the single source of truth for location and direction.
+        _table (TransitionTable):
+            Shared transition table for the plane the toy robot sits on.
+
+    Instances only hold the three slots above, without an instance dict, so
+    a live robot costs a few dozen bytes. Subclasses that do not declare
+    __slots__ of their own get an instance dict as usual.
+
     Args:
         None
     """
-    location: tuple = None
-    direction: Direction = None
+    __slots__ = ('board', '_table', '_state')
     WIDTH: int = 5
     HEIGHT: int = 5
 
-    def __init__(self, state: str = None) -> None:
+    def __init__(self, state: str = None, board: Board = None) -> None:
         """Initialise toy robot object
 
         Args:
             state (str):
             An optional robot state to initialise. Provided in the form
             {'location': {'x': 1, 'y': 2}, 'direction': 'EAST'}
+            board (Board):
+            An optional plane for the robot, an empty WIDTH by HEIGHT plane
+            is used by default.
         """
+        self.board = board if board is not None else Board.empty(self.WIDTH, self.HEIGHT)
+        self._table = self.board.transitions
+        self._state = None
         if state is not None:
+            import json  # pylint: disable=import-outside-toplevel
             robot_state = json.loads(state)
             self.place(
                 (int(robot_state['location']['x']), int(robot_state['location']['y'])),
                 Direction[str(robot_state['direction']).upper()]
             )
 
+    @property
+    def location(self) -> tuple:
+        """Current position of the toy robot, or None if it is not placed."""
+        if self._state is None:
+            return None
+        return self._table.cells[self._state >> 2]
+
+    @property
+    def direction(self) -> Direction:
+        """Current direction of the toy robot, or None if it is not placed."""
+        if self._state is None:
+            return None
+        return DIRECTIONS[self._state & 3]
+
+    def state_dict(self) -> dict:
+        """Get the state as a plain dictionary, ready to be serialised once by
+        the caller.
+
+        Returns:
+            dict: State in the form
+            {'location': {'x': 1, 'y': 2}, 'direction': 'EAST'}
+        """
+        x, y = self.location
+        return {'location': {'x': x, 'y': y}, 'direction': DIRECTIONS[self._state & 3].name}
+
     def dump_state(self) -> str:
         """Helper function to dump the state into a json format for serialising.
 
         Returns:
             str: State
         """
-        return json.dumps({
-            'location': {
-                'x': self.location[0],
-                'y': self.location[1]
-            },
-            'direction': str(self.direction)
-        })
+        import json  # pylint: disable=import-outside-toplevel
+        return json.dumps(self.state_dict())
+
+    def pack(self) -> int:
+        """Pack the state into a single integer, with the heading index in the
+        lowest two bits, y in the next PACKED_BITS bits and x above them.
+
+        Returns:
+            int: Packed state, or None if the robot is not placed
+        """
+        if self._state is None:
+            return None
+        cell, heading = self._state >> 2, self._state & 3
+        x, y = cell % self.board.width, cell // self.board.width
+        return (x << PACKED_BITS | y) << 2 | heading
+
+    def unpack(self, packed: int) -> bool:
+        """Place the robot at a state produced by pack, without building any
+        intermediate location or direction objects.
+
+        Args:
+            packed (int): Packed state
+
+        Returns:
+            bool: If the placement was valid, safe to ignore.
+        """
+        x, y = packed >> PACKED_BITS + 2, packed >> 2 & PACKED_MASK
+        if self.board.is_blocked((x, y)):
+            return False
+        self._state = (y * self.board.width + x) * 4 + (packed & 3)
+        return True
 
     def place(self, location: tuple, direction: Direction) -> bool:
         """
@@ -126,9 +440,9 @@ class ToyRobot():
         """
         if location[0] is None or location[1] is None:
             return False
-        if not 0 <= location[0] < self.WIDTH or not 0 <= location[1] < self.HEIGHT:
+        if self.board.is_blocked(location):
             return False
-        self.location, self.direction = location, direction
+        self._state = self._table.encode(location, direction)
         return True
 
     def move(self) -> bool:
@@ -137,25 +451,61 @@ class ToyRobot():
         Returns:
             bool: If the movement was valid, safe to ignore.
         """
-        if self.direction is None:
+        if self._state is None:
             return False
-        new_location = tuple(map(lambda a, b: a + b, self.location, self.direction.value))
-        if not 0 <= new_location[0] < self.WIDTH or not 0 <= new_location[1] < self.HEIGHT:
+        new_state = self._table.move[self._state]
+        if new_state == self._state:
             return False
-        self.location = new_location
+        self._state = new_state
         return True
 
     def left(self) -> None:
         '''Rotate the robot one rotation to the left.'''
-        if self.direction is None:
+        if self._state is None:
             return
-        self.direction = Direction.counterclockwise(self.direction)
+        self._state = self._table.left[self._state]
 
     def right(self) -> None:
         '''Rotate the robot one rotation to the right.'''
-        if self.direction is None:
+        if self._state is None:
+            return
+        self._state = self._table.right[self._state]
+
+    def advance(self, steps: int) -> int:
+        """Move the robot up to the given number of measures forwards in a
+        single jump, stopping at the edge of the plane or an obstacle as
+        repeated calls to move would.
+
+        Args:
+            steps (int): Number of measures to move forwards, nothing moves
+                when it is not positive
+
+        Returns:
+            int: Number of measures actually moved
+        """
+        if self._state is None or steps <= 0:
+            return 0
+        if self.board.obstacles:
+            moved = 0
+            while moved < steps and self.move():
+                moved += 1
+            return moved
+        (x, y), (dx, dy) = self.location, self.direction.value
+        new_x = min(max(x + dx * steps, 0), self.board.width - 1)
+        new_y = min(max(y + dy * steps, 0), self.board.height - 1)
+        self._state += ((new_y - y) * self.board.width + new_x - x) * 4
+        return abs(new_x - x) + abs(new_y - y)
+
+    def rotate(self, turns: int) -> None:
+        """Rotate the robot by the given number of clockwise rotations, where
+        negative values rotate counter-clockwise.
+
+        Args:
+            turns (int): Number of 90 degree clockwise rotations
+        """
+        if self._state is None:
             return
-        self.direction = Direction.clockwise(self.direction)
+        self._state += (self._state + turns) % 4 - self._state % 4
 
     def report(self) -> tuple:
         """Display the current status of the toy robot.
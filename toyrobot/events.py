@@ -0,0 +1,183 @@
+"""In-process event bus publishing toy robot state changes to watchers.
+
+Publishers record the latest state of each robot in a pending map, so many
+changes to one robot within a time window coalesce into one event. Once per
+window the pending map is serialised a single time into a batch in the
+Server-Sent Events format, and every subscriber streams the same bytes. The
+cost of a robot step therefore does not grow with the number of watchers.
+
+Batches are kept in a bounded history. A subscriber reading slower than
+batches are produced falls behind the history, skips the dropped batches and
+is told how many were dropped, so a slow watcher never holds memory on the
+server.
+"""
+
+import json
+import time
+from collections import deque
+from itertools import islice
+from threading import Condition, Thread
+
+
+class EventBus():
+    """Coalescing publisher of robot states to streaming subscribers.
+
+    Attributes:
+        window (float): Seconds between batches
+        sequence (int): Sequence number of the latest batch
+        subscribers (int): Number of open subscriptions
+
+    Args:
+        window (float): Seconds between batches
+        history (int): Number of batches kept for subscribers catching up
+    """
+
+    def __init__(self, window: float = 0.1, history: int = 256) -> None:
+        """Initialise an empty bus, the batching thread starts with the first
+        subscription.
+
+        Args:
+            window (float): Seconds between batches
+            history (int): Number of batches kept for subscribers catching up
+        """
+        self.window = window
+        self.sequence = 0
+        self.subscribers = 0
+        self._pending = {}
+        self._batches = deque(maxlen=history)
+        self._condition = Condition()
+        self._thread = None
+
+    def publish(self, key: str, state: dict) -> None:
+        """Record the new state of a robot, replacing any earlier state not yet
+        sent. Nothing is recorded while there are no subscribers.
+
+        Args:
+            key (str): ID of the robot
+            state (dict): State of the robot, as returned by state_dict
+        """
+        if not self.subscribers:
+            return
+        with self._condition:
+            self._pending[key] = state
+
+    def flush(self) -> bool:
+        """Serialise the pending states into a batch and wake subscribers.
+
+        Returns:
+            bool: If there were any pending states
+        """
+        with self._condition:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return False
+            self.sequence += 1
+            self._batches.append(f'id: {self.sequence}\nevent: states\n'
+                                 f'data: {json.dumps(pending)}\n\n'.encode())
+            self._condition.notify_all()
+        return True
+
+    def _run(self) -> None:
+        """Flush the pending states once per window, forever."""
+        while True:
+            time.sleep(self.window)
+            self.flush()
+
+    def subscribe(self, cursor: int = None, timeout: float = 15.0) -> 'Subscription':
+        """Open a subscription streaming every batch after a cursor.
+
+        Args:
+            cursor (int):
+                Sequence number of the last batch already received, such as
+                a Last-Event-ID header, only new batches by default
+            timeout (float): Seconds without batches before a keep-alive
+
+        Returns:
+            Subscription: Iterator of batches, close it when done
+        """
+        with self._condition:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self.subscribers += 1
+            cursor = self.sequence if cursor is None else min(cursor, self.sequence)
+        return Subscription(self, cursor, timeout)
+
+    def collect(self, cursor: int, timeout: float) -> tuple:
+        """Wait up to a timeout for batches after a cursor.
+
+        Args:
+            cursor (int): Sequence number of the last batch already received
+            timeout (float): Seconds to wait when there are no new batches
+
+        Returns:
+            tuple[list[bytes], int, int]:
+                The new batches still in the history, the number of newer
+                batches which were dropped from it, and the new cursor
+        """
+        with self._condition:
+            if self.sequence <= cursor:
+                self._condition.wait(timeout)
+            oldest = self.sequence - len(self._batches) + 1
+            batches = list(islice(self._batches, max(cursor + 1 - oldest, 0), None))
+            return batches, max(oldest - cursor - 1, 0), self.sequence
+
+    def unsubscribe(self) -> None:
+        """Count a subscription as closed."""
+        with self._condition:
+            self.subscribers -= 1
+
+
+class Subscription():
+    """Iterator streaming the batches of an event bus to one watcher.
+
+    The first chunk is sent straight away and only holds the reconnection
+    delay of one window in milliseconds, so the watcher gets the response
+    headers without waiting for a batch.
+
+    Attributes:
+        cursor (int): Sequence number of the last batch streamed
+
+    Args:
+        bus (EventBus): The bus to stream from
+        cursor (int): Sequence number of the last batch already received
+        timeout (float): Seconds without batches before a keep-alive
+    """
+
+    def __init__(self, bus: EventBus, cursor: int, timeout: float) -> None:
+        """Initialise a subscription, use EventBus.subscribe instead.
+
+        Args:
+            bus (EventBus): The bus to stream from
+            cursor (int): Sequence number of the last batch already received
+            timeout (float): Seconds without batches before a keep-alive
+        """
+        self.cursor = cursor
+        self._bus, self._timeout = bus, timeout
+        self._started = False
+
+    def __iter__(self) -> 'Subscription':
+        return self
+
+    def __next__(self) -> bytes:
+        if self._bus is None:
+            raise StopIteration
+        if not self._started:
+            self._started = True
+            return f'retry: {int(self._bus.window * 1000)}\n\n'.encode()
+        batches, dropped, self.cursor = self._bus.collect(self.cursor, self._timeout)
+        chunk = b''.join(batches) if batches else b': keep-alive\n\n'
+        if dropped:
+            chunk = f'event: dropped\ndata: {dropped}\n\n'.encode() + chunk
+        return chunk
+
+    def close(self) -> None:
+        """Close the subscription, called by the server when the watcher
+        disconnects."""
+        if self._bus is not None:
+            self._bus.unsubscribe()
+            self._bus = None
+
+
+EVENTS = EventBus()
+'''Shared bus every interface publishes robot state changes to'''
@@ -0,0 +1,204 @@
+"""Vectorised toy robot fleets for the toy robot demonstration.
+
+numpy is an optional dependency which is only imported by this module, so
+importing toyrobot.core does not pay for it.
+"""
+
+from toyrobot.core import Direction, Board, DIRECTIONS, HEADINGS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed by RobotFleet
+    np = None
+
+
+class RobotFleet():
+    """Vectorised collection of toy robots sharing a single plane.
+
+    Locations and headings for every robot are held in contiguous integer
+    arrays so that a command can be applied to the whole fleet, or a masked
+    subset of it, in one batched step. The bounds and obstacle rules are
+    identical to those of ToyRobot.
+
+    Attributes:
+        board (Board):
+            The plane shared by every robot in the fleet.
+        locations (numpy.ndarray):
+            Array of shape (N, 2) holding the (x, y) position of every robot.
+        headings (numpy.ndarray):
+            Array of shape (N,) holding the heading of every robot as the
+            integer index used by Direction.from_integer, or UNPLACED.
+        UNPLACED (int):
+            Constant heading value marking a robot that has not been placed.
+
+    Args:
+        size (int): Number of robots in the fleet
+        board (Board): Optional plane shared by every robot in the fleet
+    """
+    UNPLACED: int = -1
+
+    def __init__(self, size: int, board: Board = None) -> None:
+        """Initialise a fleet of unplaced toy robots.
+
+        Args:
+            size (int): Number of robots in the fleet
+            board (Board):
+                Optional plane shared by every robot in the fleet, an empty
+                ToyRobot.WIDTH by ToyRobot.HEIGHT plane is used by default.
+        """
+        if np is None:
+            raise ImportError('RobotFleet requires numpy to be installed')
+        self.board = Board.default(board)
+        self._blocked = None
+        if self.board.obstacles:
+            self._blocked = np.zeros(self.board.size, dtype=bool)
+            self._blocked[np.array(self.board.obstacle_cells(), dtype=np.int64)] = True
+        self.locations = np.zeros((size, 2), dtype=np.int64)
+        self.headings = np.full(size, self.UNPLACED, dtype=np.int8)
+        self._deltas = np.array([d.value for d in DIRECTIONS], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def _select(self, mask) -> 'np.ndarray':
+        """Combine an optional user mask with the placed robots.
+
+        Args:
+            mask (numpy.ndarray): Optional boolean array of robots to act on
+
+        Returns:
+            numpy.ndarray: Boolean array of placed robots selected by the mask
+        """
+        placed = self.headings != self.UNPLACED
+        if mask is None:
+            return placed
+        return placed & np.asarray(mask, dtype=bool)
+
+    def _is_open(self, locations) -> 'np.ndarray':
+        """Check an array of locations against the plane bounds and obstacles.
+
+        Args:
+            locations (numpy.ndarray): Array of shape (N, 2) of locations
+
+        Returns:
+            numpy.ndarray: Boolean array of locations a robot may stand at
+        """
+        open_cells = (locations[:, 0] >= 0) & (locations[:, 0] < self.board.width) & \
+                     (locations[:, 1] >= 0) & (locations[:, 1] < self.board.height)
+        if self._blocked is not None:
+            inside = locations[open_cells]
+            open_cells[open_cells] = ~self._blocked[inside[:, 1] * self.board.width + inside[:, 0]]
+        return open_cells
+
+    def place(self, locations, directions, mask=None) -> 'np.ndarray':
+        """Place the selected robots, ignoring placements outside the plane or
+        on an obstacle.
+
+        Args:
+            locations (array-like):
+                A single (x, y) location or an array of shape (N, 2)
+            directions (Direction | array-like):
+                A single direction or an array of heading indices
+            mask (array-like):
+                Optional boolean array of robots to place
+
+        Returns:
+            numpy.ndarray: Boolean array of robots that were placed
+        """
+        if isinstance(directions, Direction):
+            directions = HEADINGS[directions]
+        count = len(self)
+        locations = np.broadcast_to(np.asarray(locations, dtype=np.int64), (count, 2))
+        directions = np.broadcast_to(np.asarray(directions, dtype=np.int8) % 4, (count,))
+        valid = self._is_open(locations)
+        if mask is not None:
+            valid &= np.asarray(mask, dtype=bool)
+        self.locations[valid] = locations[valid]
+        self.headings[valid] = directions[valid]
+        return valid
+
+    def move(self, mask=None) -> 'np.ndarray':
+        """Move the selected robots one measure forwards, ignoring any move
+        that would leave the plane or run into an obstacle.
+
+        Args:
+            mask (array-like): Optional boolean array of robots to move
+
+        Returns:
+            numpy.ndarray: Boolean array of robots that moved
+        """
+        selected = self._select(mask)
+        new_locations = self.locations + self._deltas[self.headings % 4]
+        moved = selected & self._is_open(new_locations)
+        self.locations[moved] = new_locations[moved]
+        return moved
+
+    def left(self, mask=None) -> None:
+        """Rotate the selected robots one rotation to the left.
+
+        Args:
+            mask (array-like): Optional boolean array of robots to rotate
+        """
+        selected = self._select(mask)
+        self.headings[selected] = (self.headings[selected] - 1) % 4
+
+    def right(self, mask=None) -> None:
+        """Rotate the selected robots one rotation to the right.
+
+        Args:
+            mask (array-like): Optional boolean array of robots to rotate
+        """
+        selected = self._select(mask)
+        self.headings[selected] = (self.headings[selected] + 1) % 4
+
+    def advance(self, steps: int, mask=None) -> 'np.ndarray':
+        """Move the selected robots up to the given number of measures
+        forwards in a single jump, stopping at the edge of the plane or an
+        obstacle.
+
+        Args:
+            steps (int): Number of measures to move forwards, nothing moves
+                when it is not positive
+            mask (array-like): Optional boolean array of robots to move
+
+        Returns:
+            numpy.ndarray: Number of measures each robot actually moved
+        """
+        if steps <= 0:
+            return np.zeros(len(self), dtype=np.int64)
+        selected = self._select(mask)
+        if self.board.obstacles:
+            moved = np.zeros(len(self), dtype=np.int64)
+            for _ in range(steps):
+                selected = self.move(selected)
+                if not selected.any():
+                    break
+                moved += selected
+            return moved
+        new_locations = self.locations + self._deltas[self.headings % 4] * steps
+        np.clip(new_locations[:, 0], 0, self.board.width - 1, out=new_locations[:, 0])
+        np.clip(new_locations[:, 1], 0, self.board.height - 1, out=new_locations[:, 1])
+        moved = np.where(selected, np.abs(new_locations - self.locations).sum(axis=1), 0)
+        self.locations[selected] = new_locations[selected]
+        return moved
+
+    def rotate(self, turns: int, mask=None) -> None:
+        """Rotate the selected robots by the given number of clockwise
+        rotations, where negative values rotate counter-clockwise.
+
+        Args:
+            turns (int): Number of 90 degree clockwise rotations
+            mask (array-like): Optional boolean array of robots to rotate
+        """
+        selected = self._select(mask)
+        self.headings[selected] = (self.headings[selected] + turns) % 4
+
+    def report(self) -> tuple:
+        """Report the current status of every robot in the fleet.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]:
+                Copies of the (N, 2) location array and the (N,) heading array,
+                where unplaced robots have a heading of UNPLACED.
+        """
+        return self.locations.copy(), self.headings.copy()
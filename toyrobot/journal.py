@@ -0,0 +1,321 @@
+"""Append-only binary command journals of toy robots.
+
+Every command given to a JournalRobot is appended to its journal as a binary
+record of a tag byte and a fixed size payload, a single byte for MOVE, LEFT
+and RIGHT. Every interval steps a snapshot of the full state is appended and
+its offset written to a sidecar index of fixed size entries, so the state at
+any step is reconstructed by seeking to the nearest earlier snapshot and
+replaying only the records after it.
+
+A record left partly written by a crash is ignored when the journal is read
+and cut off when it is reopened for writing.
+"""
+
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from toyrobot.core import ToyRobot, Direction, Board, DIRECTIONS, HEADINGS
+
+MAGIC = b'TRJ1'
+'''Leading bytes of every journal file, identifying the format version'''
+
+MOVE, LEFT, RIGHT, PLACE, ADVANCE, ROTATE, STATE, SNAPSHOT = range(8)
+'''Record tags, every tag except SNAPSHOT counts as one step'''
+
+PAYLOADS = {
+    MOVE: struct.Struct('<'),
+    LEFT: struct.Struct('<'),
+    RIGHT: struct.Struct('<'),
+    PLACE: struct.Struct('<qqB'),
+    ADVANCE: struct.Struct('<q'),
+    ROTATE: struct.Struct('<B'),
+    STATE: struct.Struct('<qqb'),
+    SNAPSHOT: struct.Struct('<Qqqb'),
+}
+'''Payload layout following the tag byte of each record'''
+
+
+class JournalRobot(ToyRobot):
+    """A toy robot appending every command it is given to a journal.
+
+    Attributes:
+        path (str): Path of the journal, the index is kept at path + '.idx'
+        interval (int): Number of steps between snapshots
+        steps (int): Number of steps recorded in the journal
+
+    Args:
+        path (str): Path of the journal, continued if it already exists
+        board (Board): Optional plane, the default empty plane if not given
+        interval (int): Number of steps between snapshots
+    """
+
+    def __init__(self, path: str, board: Board = None, interval: int = 1024) -> None:
+        """Open or create a journal, restoring the last recorded state.
+
+        Args:
+            path (str): Path of the journal, continued if it already exists
+            board (Board):
+                Optional plane, an empty ToyRobot.WIDTH by ToyRobot.HEIGHT
+                plane is used by default. It must match the plane the journal
+                was recorded on.
+            interval (int): Number of steps between snapshots
+        """
+        super().__init__(board=board)
+        self.path, self.interval = path, interval
+        self._replaying = True
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.steps = 0
+        if exists:
+            self.steps, end = _read(path, self)
+            _truncate(path, end)
+        self._replaying = False
+        self._file = open(path, 'ab')  # pylint: disable=consider-using-with
+        self._index = open(path + '.idx', 'ab')  # pylint: disable=consider-using-with
+        if not exists:
+            self._file.write(MAGIC)
+            self.snapshot()
+
+    def __enter__(self) -> 'JournalRobot':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _state_payload(self) -> tuple:
+        """Get the current state as the x, y and heading of a record."""
+        if self._state is None:
+            return 0, 0, -1
+        x, y = self.location
+        return x, y, self._state & 3
+
+    def _record(self, tag: int, *payload) -> None:
+        """Append a step record, followed by a snapshot every interval steps."""
+        if self._replaying:
+            return
+        self._file.write(bytes((tag,)) + PAYLOADS[tag].pack(*payload))
+        self.steps += 1
+        if self.steps % self.interval == 0:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Append a snapshot of the current state and index it."""
+        self._file.flush()
+        offset = self._file.tell()
+        self._file.write(bytes((SNAPSHOT,)) +
+                         PAYLOADS[SNAPSHOT].pack(self.steps, *self._state_payload()))
+        self._file.flush()
+        self._index.write(struct.pack('<QQ', self.steps, offset))
+        self._index.flush()
+
+    def flush(self) -> None:
+        """Write every buffered record to the journal."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the journal."""
+        self._file.close()
+        self._index.close()
+
+    def place(self, location: tuple, direction: Direction) -> bool:
+        """Place the robot, recording the command.
+
+        Args:
+            location (tuple[int, int]):
+                Tuple representation of the new location
+            direction (Direction):
+                Direction the new toy robot should begin facing
+
+        Returns:
+            bool: If the placement was valid, safe to ignore.
+        """
+        placed = super().place(location, direction)
+        if location[0] is not None and location[1] is not None:
+            self._record(PLACE, location[0], location[1], HEADINGS[direction])
+        return placed
+
+    def unpack(self, packed: int) -> bool:
+        """Place the robot at a packed state, recording the new state.
+
+        Args:
+            packed (int): Packed state
+
+        Returns:
+            bool: If the placement was valid, safe to ignore.
+        """
+        placed = super().unpack(packed)
+        self._record(STATE, *self._state_payload())
+        return placed
+
+    def move(self) -> bool:
+        """Move the robot one measure forwards, recording the command.
+
+        Returns:
+            bool: If the movement was valid, safe to ignore.
+        """
+        moved = super().move()
+        self._record(MOVE)
+        return moved
+
+    def left(self) -> None:
+        '''Rotate the robot one rotation to the left, recording the command.'''
+        super().left()
+        self._record(LEFT)
+
+    def right(self) -> None:
+        '''Rotate the robot one rotation to the right, recording the command.'''
+        super().right()
+        self._record(RIGHT)
+
+    def advance(self, steps: int) -> int:
+        """Move the robot up to the given number of measures forwards,
+        recording the command as a single step.
+
+        Args:
+            steps (int): Number of measures to move forwards
+
+        Returns:
+            int: Number of measures actually moved
+        """
+        replaying, self._replaying = self._replaying, True
+        try:
+            moved = super().advance(steps)
+        finally:
+            self._replaying = replaying
+        self._record(ADVANCE, steps)
+        return moved
+
+    def rotate(self, turns: int) -> None:
+        """Rotate the robot by the given number of clockwise rotations,
+        recording the command.
+
+        Args:
+            turns (int): Number of 90 degree clockwise rotations
+        """
+        super().rotate(turns)
+        self._record(ROTATE, turns % 4)
+
+
+def _restore(robot: ToyRobot, x: int, y: int, heading: int) -> None:
+    """Set a robot to the state of a STATE or SNAPSHOT record."""
+    if heading < 0:
+        robot._state = None  # pylint: disable=protected-access
+    else:
+        ToyRobot.place(robot, (x, y), DIRECTIONS[heading])
+
+
+def _apply(robot: ToyRobot, tag: int, payload: tuple) -> None:
+    """Apply a step record to a robot."""
+    if tag == MOVE:
+        robot.move()
+    elif tag == LEFT:
+        robot.left()
+    elif tag == RIGHT:
+        robot.right()
+    elif tag == PLACE:
+        robot.place(payload[:2], DIRECTIONS[payload[2]])
+    elif tag == ADVANCE:
+        robot.advance(payload[0])
+    elif tag == ROTATE:
+        robot.rotate(payload[0])
+    elif tag == STATE:
+        _restore(robot, *payload)
+
+
+def _index(path: str) -> array:
+    """Read the complete step and offset pairs of the index of a journal."""
+    index = array('Q')
+    if os.path.exists(path + '.idx'):
+        with open(path + '.idx', 'rb') as file:
+            data = file.read()
+        index.frombytes(data[:len(data) - len(data) % 16])
+    return index
+
+
+def _truncate(path: str, end: int) -> None:
+    """Cut a partly written record off the end of a journal, along with any
+    index entries after it."""
+    if os.path.getsize(path) > end:
+        os.truncate(path, end)
+    index = _index(path)
+    while index and index[-1] >= end:
+        del index[-2:]
+    if os.path.exists(path + '.idx') and os.path.getsize(path + '.idx') > len(index) * 8:
+        os.truncate(path + '.idx', len(index) * 8)
+
+
+def _read(path: str, robot: ToyRobot, step: int = None) -> tuple:
+    """Replay a journal onto a robot, returning the step reached and the
+    offset just after the last complete record read."""
+    index = _index(path)
+    steps, offsets = index[0::2], index[1::2]
+    nearest = bisect_right(steps, step) - 1 if step is not None else len(steps) - 1
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a toy robot journal')
+        if nearest >= 0:
+            file.seek(offsets[nearest])
+        current, end = 0, file.tell()
+        while step is None or current < step:
+            tag = file.read(1)
+            if not tag:
+                break
+            if tag[0] not in PAYLOADS:
+                raise ValueError(f'{path} holds an unknown record at offset {end}')
+            layout = PAYLOADS[tag[0]]
+            data = file.read(layout.size)
+            if len(data) < layout.size:
+                break
+            payload, end = layout.unpack(data), file.tell()
+            if tag[0] == SNAPSHOT:
+                current = payload[0]
+                _restore(robot, *payload[1:])
+                continue
+            _apply(robot, tag[0], payload)
+            current += 1
+    if step is not None and current < step:
+        raise ValueError(f'{path} holds {current} steps, not {step}')
+    return current, end
+
+
+def replay(path: str, robot: ToyRobot, step: int = None) -> int:
+    """Replay a journal onto a robot from the nearest snapshot at or before a
+    step.
+
+    Args:
+        path (str): Path of the journal
+        robot (ToyRobot): Robot on the plane the journal was recorded on
+        step (int): Step to stop at, the end of the journal if not given
+
+    Raises:
+        ValueError:
+            If the file is not a journal, holds an unknown record or holds
+            fewer steps
+
+    Returns:
+        int: The step the robot was left at
+    """
+    return _read(path, robot, step)[0]
+
+
+def state_at(path: str, step: int, board: Board = None) -> ToyRobot:
+    """Reconstruct the robot recorded in a journal as it was at a step.
+
+    Args:
+        path (str): Path of the journal
+        step (int): Number of recorded steps to apply
+        board (Board):
+            Optional plane the journal was recorded on, an empty
+            ToyRobot.WIDTH by ToyRobot.HEIGHT plane is used by default.
+
+    Raises:
+        ValueError:
+            If the file is not a journal, holds an unknown record or holds
+            fewer steps
+
+    Returns:
+        ToyRobot: A new robot in the state after the step
+    """
+    robot = ToyRobot(board=board)
+    replay(path, robot, step)
+    return robot
@@ -0,0 +1,185 @@
+"""Opt-in instrumentation of toy robot operations.
+
+Classes register the methods worth measuring, and enabling the METRICS
+registry wraps those methods to record call counts, rejected calls (methods
+returning False, such as a move off the plane) and latency histograms.
+Disabling it restores the original methods, so instrumentation costs nothing
+while it is disabled.
+"""
+
+from functools import wraps
+from time import perf_counter_ns
+from toyrobot.core import ToyRobot
+
+BUCKETS = 64
+'''Number of latency histogram buckets, bucket i counts calls under 2**i ns'''
+
+
+class Metrics():
+    """Registry of operation counters and latency histograms.
+
+    Counters are updated without locking, so counts from many threads are
+    approximate.
+
+    Attributes:
+        enabled (bool): If instrumentation is currently enabled
+        counts (dict[str, int]): Number of calls of each operation
+        rejected (dict[str, int]): Number of calls returning False
+        totals (dict[str, int]): Total nanoseconds spent in each operation
+        histograms (dict[str, list[int]]): Latency histogram of each operation
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty, disabled registry."""
+        self.enabled = False
+        self._targets = []
+        self._originals = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every recorded measurement."""
+        self.counts, self.rejected, self.totals, self.histograms = {}, {}, {}, {}
+
+    def register(self, cls: type, prefix: str, *names: str) -> None:
+        """Register methods of a class to instrument while enabled.
+
+        Args:
+            cls (type): Class defining the methods
+            prefix (str): Prefix of the operation names, such as 'robot'
+            *names (str): Names of the methods
+        """
+        for name in names:
+            target = (cls, name, f'{prefix}.{name}')
+            self._targets.append(target)
+            if self.enabled:
+                self._wrap(*target)
+
+    def enable(self) -> None:
+        """Start recording every registered operation."""
+        if self.enabled:
+            return
+        self.enabled = True
+        for target in self._targets:
+            self._wrap(*target)
+
+    def disable(self) -> None:
+        """Stop recording and restore the original methods."""
+        self.enabled = False
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    def _wrap(self, cls: type, name: str, operation: str) -> None:
+        """Replace a method with one recording each call."""
+        original = cls.__dict__[name]
+        self._originals[(cls, name)] = original
+
+        @wraps(original)
+        def instrumented(*args, **kwargs):
+            start = perf_counter_ns()
+            result = original(*args, **kwargs)
+            self.observe(operation, perf_counter_ns() - start, result is False)
+            return result
+        setattr(cls, name, instrumented)
+
+    def timed(self, operation: str):
+        """Decorate a function to record its calls while enabled. Unlike
+        registered methods the decorated function always checks the flag, so
+        it suits calls far slower than a robot command.
+
+        Args:
+            operation (str): Name of the operation
+
+        Returns:
+            Callable: The decorator
+        """
+        def decorator(function):
+            @wraps(function)
+            def instrumented(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = perf_counter_ns()
+                result = function(*args, **kwargs)
+                self.observe(operation, perf_counter_ns() - start, result is False)
+                return result
+            return instrumented
+        return decorator
+
+    def observe(self, operation: str, nanoseconds: int, rejected: bool = False) -> None:
+        """Record a single call of an operation.
+
+        Args:
+            operation (str): Name of the operation
+            nanoseconds (int): Time taken by the call
+            rejected (bool): If the call was rejected
+        """
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = [0] * BUCKETS
+            self.counts[operation] = self.rejected[operation] = self.totals[operation] = 0
+        histogram[min(nanoseconds.bit_length(), BUCKETS - 1)] += 1
+        self.counts[operation] += 1
+        self.totals[operation] += nanoseconds
+        if rejected:
+            self.rejected[operation] += 1
+
+    def percentile(self, operation: str, fraction: float) -> int:
+        """Estimate a latency percentile from the histogram of an operation.
+
+        Args:
+            operation (str): Name of the operation
+            fraction (float): Percentile as a fraction, such as 0.99
+
+        Returns:
+            int: Upper bound of the bucket holding the percentile, in ns
+        """
+        target, seen = fraction * self.counts[operation], 0
+        for bucket, count in enumerate(self.histograms[operation]):
+            seen += count
+            if count and seen >= target:
+                return 1 << bucket
+        return 1 << (BUCKETS - 1)
+
+    def summary(self) -> str:
+        """Render the measurements as a human readable table.
+
+        Returns:
+            str: One line per operation
+        """
+        lines = [f"{'operation':<20} {'count':>10} {'rejected':>9} {'mean ns':>9} "
+                 f"{'p50 ns':>9} {'p99 ns':>9}"]
+        for operation in sorted(self.counts):
+            count = self.counts[operation]
+            lines.append(f'{operation:<20} {count:>10} {self.rejected[operation]:>9} '
+                         f'{self.totals[operation] // count:>9} '
+                         f'{self.percentile(operation, 0.5):>9} '
+                         f'{self.percentile(operation, 0.99):>9}')
+        return '\n'.join(lines)
+
+    def render(self) -> str:
+        """Render the measurements in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition
+        """
+        lines = ['# TYPE toyrobot_operation_seconds histogram',
+                 '# TYPE toyrobot_operation_rejected_total counter']
+        for operation in sorted(self.counts):
+            label = f'operation="{operation}"'
+            cumulative = 0
+            for bucket, count in enumerate(self.histograms[operation]):
+                cumulative += count
+                lines.append(f'toyrobot_operation_seconds_bucket{{{label},'
+                             f'le="{(1 << bucket) / 1e9:g}"}} {cumulative}')
+            lines.append(f'toyrobot_operation_seconds_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'toyrobot_operation_seconds_sum{{{label}}} '
+                         f'{self.totals[operation] / 1e9:g}')
+            lines.append(f'toyrobot_operation_seconds_count{{{label}}} {cumulative}')
+            lines.append(f'toyrobot_operation_rejected_total{{{label}}} '
+                         f'{self.rejected[operation]}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()
+'''Shared registry used by every interface'''
+METRICS.register(ToyRobot, 'robot', 'place', 'move', 'left', 'right', 'advance', 'rotate')
@@ -0,0 +1,145 @@
+"""Route planning between toy robot states.
+
+A route is the shortest list of MOVE, LEFT and RIGHT commands taking a robot
+from one location and direction to another without leaving the plane or
+entering an obstacle. Routes are found by a breadth-first search backwards
+from the goal over the encoded states of a TransitionTable. The distance of
+every state to a goal is kept, so further routes to the same goal are read off
+the distances without searching again. Distances are kept as 32-bit integers
+and the cache is bounded by memory as well as by the number of goals, so large
+boards do not hold gigabytes of distances.
+"""
+
+from array import array
+from collections import OrderedDict, deque
+from toyrobot.core import Direction, Board, DIRECTIONS
+
+COMMANDS = ('MOVE', 'LEFT', 'RIGHT')
+'''Commands a route is made of, in the order they are preferred'''
+UNREACHABLE = -1
+'''Distance of a state from which the goal cannot be reached'''
+MEMORY = 256 * 2 ** 20
+'''Default largest number of bytes of distances to keep'''
+
+
+class Planner():
+    """Shortest route planner for one board.
+
+    Attributes:
+        board (Board): The plane routes are planned on
+        capacity (int): Largest number of goals to keep distances for
+        memory (int): Largest number of bytes of distances to keep
+
+    Args:
+        board (Board): Optional plane, the default empty plane if not given
+        capacity (int): Largest number of goals to keep distances for
+        memory (int): Largest number of bytes of distances to keep
+    """
+
+    def __init__(self, board: Board = None, capacity: int = 64,
+                 memory: int = MEMORY) -> None:
+        """Initialise a planner without any cached distances.
+
+        Args:
+            board (Board):
+                Optional plane, an empty ToyRobot.WIDTH by ToyRobot.HEIGHT
+                plane is used by default.
+            capacity (int): Largest number of goals to keep distances for
+            memory (int):
+                Largest number of bytes of distances to keep, the distances
+                to the latest goal are always kept
+        """
+        self.board = Board.default(board)
+        self.capacity = capacity
+        self.memory = memory
+        self._table = self.board.transitions
+        self._typecode = 'i' if self.board.size * 4 < 2 ** 31 else 'q'
+        self._fields = OrderedDict()
+        self._bytes = 0
+
+    def _encode(self, location: tuple, direction: Direction) -> int:
+        """Encode a location and direction, rejecting blocked locations."""
+        if self.board.is_blocked(location):
+            raise ValueError(f'{location} is not an open location on the board')
+        return self._table.encode(location, direction)
+
+    def distances(self, location: tuple, direction: Direction) -> array:
+        """Get the number of commands needed to reach a goal from every state.
+
+        Args:
+            location (tuple[int, int]): Goal location
+            direction (Direction): Goal direction
+
+        Raises:
+            ValueError: If the goal is off the plane or an obstacle
+
+        Returns:
+            array[int]:
+                Distance indexed by encoded state, UNREACHABLE for states which
+                cannot reach the goal
+        """
+        goal = self._encode(location, direction)
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            return field
+        field = self._search(goal)
+        self._fields[goal] = field
+        self._bytes += field.itemsize * len(field)
+        while len(self._fields) > 1 and (len(self._fields) > self.capacity or
+                                         self._bytes > self.memory):
+            _, evicted = self._fields.popitem(last=False)
+            self._bytes -= evicted.itemsize * len(evicted)
+        return field
+
+    def _search(self, goal: int) -> array:
+        """Breadth-first search backwards from a goal state."""
+        table, width, board = self._table, self._table.width, self.board
+        field = array(self._typecode, [UNREACHABLE]) * (board.size * 4)
+        field[goal] = 0
+        queue = deque((goal,))
+        while queue:
+            state = queue.popleft()
+            distance = field[state] + 1
+            heading = state & 3
+            dx, dy = DIRECTIONS[heading].value
+            cell = state >> 2
+            previous = [table.right[state], table.left[state]]
+            if not board.is_blocked((cell % width - dx, cell // width - dy)):
+                previous.append(state - (dy * width + dx) * 4)
+            for before in previous:
+                if field[before] == UNREACHABLE:
+                    field[before] = distance
+                    queue.append(before)
+        return field
+
+    def plan(self, location: tuple, direction: Direction,
+             goal_location: tuple, goal_direction: Direction) -> list:
+        """Plan the shortest route between two states.
+
+        Args:
+            location (tuple[int, int]): Start location
+            direction (Direction): Start direction
+            goal_location (tuple[int, int]): Goal location
+            goal_direction (Direction): Goal direction
+
+        Raises:
+            ValueError: If the start or goal is off the plane or an obstacle
+
+        Returns:
+            list[str]: Commands of the route, or None if the goal is unreachable
+        """
+        field = self.distances(goal_location, goal_direction)
+        state = self._encode(location, direction)
+        if field[state] == UNREACHABLE:
+            return None
+        transitions = (self._table.move, self._table.left, self._table.right)
+        route = []
+        while field[state]:
+            for command, transition in zip(COMMANDS, transitions):
+                following = transition[state]
+                if field[following] == field[state] - 1:
+                    route.append(command)
+                    state = following
+                    break
+        return route
@@ -0,0 +1,231 @@
+"""Compiled command programs for the toy robot demonstration.
+
+A command script is parsed once into a compact opcode array which can then be
+executed many times against toy robots or fleets without re-tokenising.
+"""
+
+from array import array
+from toyrobot.core import ToyRobot, Direction, HEADINGS
+
+OP_PLACE = 0
+'''Place the robot, followed by the x, y and heading operands'''
+OP_MOVE = 1
+'''Move the robot forwards, followed by the number of measures to move'''
+OP_TURN = 2
+'''Rotate the robot, followed by the number of clockwise rotations'''
+OP_REPORT = 3
+'''Report the current status of the robot, takes no operands'''
+
+OPERANDS = {OP_PLACE: 3, OP_MOVE: 1, OP_TURN: 1, OP_REPORT: 0}
+'''Number of operands following each opcode in a compiled program'''
+
+
+class Program():
+    """A command script compiled into a flat array of opcodes and operands.
+
+    Consecutive LEFT/RIGHT commands are folded into a single rotation and
+    consecutive MOVE commands are collapsed into a single clamped jump, so
+    execution cost is proportional to the number of opcodes.
+
+    Attributes:
+        code (array.array):
+            Flat opcode stream, each opcode followed by its operands.
+
+    Args:
+        code (array.array): A compiled opcode stream
+    """
+
+    def __init__(self, code: array) -> None:
+        """Initialise a program from an already compiled opcode stream.
+
+        Args:
+            code (array.array): A compiled opcode stream
+        """
+        self.code = code
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def instructions(self):
+        """Iterate over the decoded instructions of the program.
+
+        Yields:
+            tuple[int, tuple[int, ...]]: Each opcode with its operands
+        """
+        code, index = self.code, 0
+        while index < len(code):
+            opcode = code[index]
+            width = OPERANDS[opcode]
+            yield opcode, tuple(code[index + 1:index + 1 + width])
+            index += 1 + width
+
+    def run(self, robot: ToyRobot) -> list:
+        """Execute the program against a single toy robot.
+
+        Args:
+            robot (ToyRobot): The toy robot to run the program on
+
+        Returns:
+            list[tuple[tuple[int, int], Direction]]:
+                The report of every REPORT command issued while the robot was
+                placed on the plane.
+        """
+        reports = []
+        code, index, size = self.code, 0, len(self.code)
+        while index < size:
+            opcode = code[index]
+            if opcode == OP_MOVE:
+                robot.advance(code[index + 1])
+            elif opcode == OP_TURN:
+                robot.rotate(code[index + 1])
+            elif opcode == OP_PLACE:
+                robot.place((code[index + 1], code[index + 2]),
+                            Direction.from_integer(code[index + 3]))
+            elif opcode == OP_REPORT and robot.direction is not None:
+                reports.append(robot.report())
+            index += 1 + OPERANDS[opcode]
+        return reports
+
+    def repeat(self, robot: ToyRobot, times: int) -> int:
+        """Execute the program against a toy robot the given number of times
+        without stepping through every repetition. The robot state after each
+        repetition only depends on the state before it, and the plane has a
+        finite number of states, so the states eventually cycle. Once a state
+        is seen again the remaining whole cycles are skipped. Reports are not
+        collected.
+
+        Args:
+            robot (ToyRobot): The toy robot to run the program on
+            times (int): Number of repetitions
+
+        Returns:
+            int: Number of repetitions actually executed
+        """
+        seen, executed = {}, 0
+        while executed < times:
+            state = robot.pack()
+            if state in seen:
+                remaining = (times - executed) % (executed - seen[state])
+                for _ in range(remaining):
+                    self.run(robot)
+                return executed + remaining
+            seen[state] = executed
+            self.run(robot)
+            executed += 1
+        return executed
+
+    def run_fleet(self, fleet: 'RobotFleet') -> list:
+        """Execute the program against every robot in a fleet at once, so a
+        batch of start states can be replayed in a single pass.
+
+        Args:
+            fleet (RobotFleet): The fleet of robots to run the program on
+
+        Returns:
+            list[tuple[numpy.ndarray, numpy.ndarray]]:
+                The fleet report of every REPORT command.
+        """
+        reports = []
+        for opcode, operands in self.instructions():
+            if opcode == OP_MOVE:
+                fleet.advance(operands[0])
+            elif opcode == OP_TURN:
+                fleet.rotate(operands[0])
+            elif opcode == OP_PLACE:
+                fleet.place(operands[:2], operands[2])
+            elif opcode == OP_REPORT:
+                reports.append(fleet.report())
+        return reports
+
+
+def parse_place(arguments: list) -> tuple:
+    """Parse the arguments of a PLACE command, as both Cli.place and
+    compile_script do.
+
+    Args:
+        arguments (list[str]):
+            Arguments in either the {X,Y,FACING} or {X Y FACING} format
+
+    Raises:
+        ValueError:
+            If there is not exactly an x, y and facing, the location is not
+            integers or the facing is not a direction
+
+    Returns:
+        tuple[tuple[int, int], Direction]: The location and direction
+    """
+    if len(arguments) == 1:
+        arguments = arguments[0].split(',')
+    if len(arguments) != 3:
+        raise ValueError(f'PLACE takes an x, y and facing, not {len(arguments)} arguments')
+    x, y, d = arguments
+    if d.upper() not in Direction.__members__:
+        raise ValueError(f"'{d}' is not a direction")
+    return (int(x), int(y)), Direction[d.upper()]
+
+
+def _fold(code: array, starts: list, opcode: int, operand: int) -> None:
+    """Append a MOVE or TURN instruction, folding it into the previous
+    instruction when that has the same opcode.
+
+    Args:
+        code (array.array): The opcode stream being compiled
+        starts (list[int]): Index of the start of every instruction in code
+        opcode (int): Either OP_MOVE or OP_TURN
+        operand (int): Number of measures or clockwise rotations
+    """
+    if not starts or code[starts[-1]] != opcode:
+        starts.append(len(code))
+        code.extend((opcode, operand % 4 if opcode == OP_TURN else operand))
+        return
+    code[-1] += operand
+    if opcode == OP_TURN:
+        code[-1] %= 4
+        if code[-1] == 0:
+            del code[starts.pop():]
+
+
+def compile_script(script) -> Program:
+    """Compile a PLACE/MOVE/LEFT/RIGHT/REPORT command script into a program.
+
+    Commands are parsed with the same rules as Cli.parse. HELP and STATS
+    commands and blank lines are dropped, and a QUIT command ends the script.
+
+    Args:
+        script (str | Iterable[str]):
+            Newline separated commands, or an iterable of command lines
+
+    Raises:
+        ValueError: If a command is not recognised or a PLACE is malformed
+
+    Returns:
+        Program: The compiled program
+    """
+    if isinstance(script, str):
+        script = script.splitlines()
+    code, starts = array('q'), []
+    for line in script:
+        user_input = line.lower().strip()
+        if not user_input:
+            continue
+        command, *arguments = user_input.split(' ')
+        if command == 'move':
+            _fold(code, starts, OP_MOVE, 1)
+        elif command in ('left', 'right'):
+            _fold(code, starts, OP_TURN, 1 if command == 'right' else -1)
+        elif command == 'place':
+            try:
+                (x, y), direction = parse_place(arguments)
+            except ValueError:
+                raise ValueError(f"'{user_input}' is not recognised") from None
+            starts.append(len(code))
+            code.append(OP_PLACE)
+            code.extend((x, y, HEADINGS[direction]))
+        elif command == 'report':
+            starts.append(len(code))
+            code.append(OP_REPORT)
+        elif command == 'quit':
+            break
+        elif command not in ('help', 'stats'):
+            raise ValueError(f"'{user_input}' is not recognised")
+    return Program(code)
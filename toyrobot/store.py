@@ -0,0 +1,158 @@
+"""Server-side stores for toy robot states keyed by a robot ID.
+
+States are kept in the packed integer form produced by ToyRobot.pack so every
+backend only has to hold one integer per robot.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from urllib.parse import urlparse, parse_qs
+import sqlite3
+
+
+class StateStore(ABC):
+    """Base class of a store mapping robot IDs to packed robot states, a
+    backend must implement get, set and delete before it can be created."""
+
+    @abstractmethod
+    def get(self, robot_id: str) -> int:
+        """Get the packed state of a robot.
+
+        Args:
+            robot_id (str): ID of the robot
+
+        Returns:
+            int: Packed state, or None if the robot is not stored
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, robot_id: str, packed: int) -> None:
+        """Store the packed state of a robot.
+
+        Args:
+            robot_id (str): ID of the robot
+            packed (int): Packed state
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, robot_id: str) -> None:
+        """Remove a robot from the store, if it is stored.
+
+        Args:
+            robot_id (str): ID of the robot
+        """
+        raise NotImplementedError
+
+
+class MemoryStore(StateStore):
+    """In-process store which evicts the least recently used robot once it
+    holds more than capacity robots. States are not shared between processes.
+
+    Args:
+        capacity (int): Largest number of robots to hold
+    """
+
+    def __init__(self, capacity: int = 100000) -> None:
+        """Initialise an empty store.
+
+        Args:
+            capacity (int): Largest number of robots to hold
+        """
+        self.capacity = capacity
+        self._states = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, robot_id: str) -> int:
+        with self._lock:
+            packed = self._states.get(robot_id)
+            if packed is not None:
+                self._states.move_to_end(robot_id)
+            return packed
+
+    def set(self, robot_id: str, packed: int) -> None:
+        with self._lock:
+            self._states[robot_id] = packed
+            self._states.move_to_end(robot_id)
+            while len(self._states) > self.capacity:
+                self._states.popitem(last=False)
+
+    def delete(self, robot_id: str) -> None:
+        with self._lock:
+            self._states.pop(robot_id, None)
+
+
+class SqliteStore(StateStore):
+    """Store backed by an SQLite database file, which every worker process on
+    the host can share.
+
+    Args:
+        path (str): Path of the database file
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open the database, creating the robots table if needed.
+
+        Args:
+            path (str): Path of the database file
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False,
+                                           isolation_level=None)
+        self._lock = Lock()
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS robots (id TEXT PRIMARY KEY, state INTEGER NOT NULL)')
+
+    def get(self, robot_id: str) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT state FROM robots WHERE id = ?', (robot_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, robot_id: str, packed: int) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO robots (id, state) VALUES (?, ?)', (robot_id, packed))
+
+    def delete(self, robot_id: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM robots WHERE id = ?', (robot_id,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def open_store(url: str) -> StateStore:
+    """Open a state store from a URL, either memory://?capacity=N for an
+    in-process store or an sqlite URL for a shared database. A database path
+    is relative to the working directory with two slashes, as in
+    sqlite://robots.db, and absolute with three, as in
+    sqlite:///var/lib/robots.db.
+
+    Args:
+        url (str): URL of the store
+
+    Raises:
+        ValueError: If the URL scheme is not a known backend or has no path
+
+    Returns:
+        StateStore: The opened store
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == 'memory':
+        capacity = parse_qs(parsed.query).get('capacity')
+        return MemoryStore(int(capacity[0])) if capacity else MemoryStore()
+    if parsed.scheme == 'sqlite':
+        if not parsed.netloc + parsed.path:
+            raise ValueError(f"'{url}' has no database path")
+        return SqliteStore(parsed.netloc + parsed.path)
+    raise ValueError(f"'{url}' is not a known state store")
@@ -0,0 +1,188 @@
+"""Shared worlds holding many toy robots on one plane.
+
+Robots in a world reject moves and placements into cells occupied by another
+robot, in the same way moves off the plane are rejected. Occupancy is kept in
+a hashed grid index so a collision check costs the same no matter how many
+robots share the world.
+"""
+
+from toyrobot.core import ToyRobot, Direction, Board, DIRECTIONS, PACKED_BITS, PACKED_MASK
+from toyrobot.metrics import METRICS
+
+
+class World():
+    """A plane shared by many toy robots.
+
+    Attributes:
+        board (Board): The plane shared by every robot in the world
+        robots (list[WorldRobot]): Every robot spawned in the world
+
+    Args:
+        board (Board): Optional plane, the default empty plane if not given
+    """
+
+    def __init__(self, board: Board = None) -> None:
+        """Initialise an empty world.
+
+        Args:
+            board (Board):
+                Optional plane shared by every robot, an empty
+                ToyRobot.WIDTH by ToyRobot.HEIGHT plane is used by default.
+        """
+        self.board = Board.default(board)
+        self.robots = []
+        self._occupants = {}
+
+    def __len__(self) -> int:
+        return len(self.robots)
+
+    def spawn(self) -> 'WorldRobot':
+        """Create a new unplaced robot in the world.
+
+        Returns:
+            WorldRobot: The new robot
+        """
+        robot = WorldRobot(self)
+        self.robots.append(robot)
+        return robot
+
+    def remove(self, robot: 'WorldRobot') -> None:
+        """Remove a robot from the world, freeing the cell it occupies.
+
+        Args:
+            robot (WorldRobot): The robot to remove
+        """
+        self.robots.remove(robot)
+        if robot.location is not None:
+            del self._occupants[self._cell(robot.location)]
+
+    def _cell(self, location: tuple) -> int:
+        """Get the cell index of a location on the plane."""
+        return location[1] * self.board.width + location[0]
+
+    def is_occupied(self, cell: int) -> bool:
+        """Check if a cell is occupied by a robot.
+
+        Args:
+            cell (int): Cell index, y * width + x
+
+        Returns:
+            bool: If a robot is standing in the cell
+        """
+        return cell in self._occupants
+
+    def robot_at(self, location: tuple) -> 'WorldRobot':
+        """Get the robot standing at a location.
+
+        Args:
+            location (tuple[int, int]): Location on the plane
+
+        Returns:
+            WorldRobot: The robot at the location, or None if it is free
+        """
+        return self._occupants.get(self._cell(location))
+
+    def relocate(self, robot: 'WorldRobot', old_cell: int, new_cell: int) -> None:
+        """Update the occupancy index after a robot changes cell.
+
+        Args:
+            robot (WorldRobot): The robot that moved
+            old_cell (int): Previous cell index, or None if it was unplaced
+            new_cell (int): New cell index
+        """
+        if old_cell is not None:
+            del self._occupants[old_cell]
+        self._occupants[new_cell] = robot
+
+
+class WorldRobot(ToyRobot):
+    """A toy robot living in a shared world alongside other robots.
+
+    Attributes:
+        world (World): The world the robot lives in
+
+    Args:
+        world (World): The world the robot lives in
+    """
+
+    def __init__(self, world: World) -> None:
+        """Initialise an unplaced robot in the world.
+
+        Args:
+            world (World): The world the robot lives in
+        """
+        super().__init__(board=world.board)
+        self.world = world
+
+    def place(self, location: tuple, direction: Direction) -> bool:
+        """
+        Place the robot at the given location, ignoring placements onto a cell
+        occupied by another robot.
+
+        Args:
+            location (tuple[int, int]):
+                Tuple representation of the new location
+            direction (Direction):
+                Direction the robot should begin facing
+
+        Returns:
+            bool: If the placement was valid, safe to ignore.
+        """
+        old_cell = None if self._state is None else self._state >> 2
+        if location[0] is None or location[1] is None:
+            return False
+        occupant = self.world.robot_at(location)
+        if occupant is not None and occupant is not self:
+            return False
+        if not super().place(location, direction):
+            return False
+        if old_cell != self._state >> 2:
+            self.world.relocate(self, old_cell, self._state >> 2)
+        return True
+
+    def unpack(self, packed: int) -> bool:
+        """Place the robot at a packed state, ignoring placements onto a cell
+        occupied by another robot.
+
+        Args:
+            packed (int): Packed state
+
+        Returns:
+            bool: If the placement was valid, safe to ignore.
+        """
+        location = (packed >> PACKED_BITS + 2, packed >> 2 & PACKED_MASK)
+        return self.place(location, DIRECTIONS[packed & 3])
+
+    def move(self) -> bool:
+        """Move the robot one measure forwards, ignoring moves off the plane,
+        into an obstacle or into a cell occupied by another robot.
+
+        Returns:
+            bool: If the movement was valid, safe to ignore.
+        """
+        if self._state is None:
+            return False
+        new_state = self._table.move[self._state]
+        if new_state == self._state or self.world.is_occupied(new_state >> 2):
+            return False
+        self.world.relocate(self, self._state >> 2, new_state >> 2)
+        self._state = new_state
+        return True
+
+    def advance(self, steps: int) -> int:
+        """Move the robot up to the given number of measures forwards, stopping
+        in front of the first robot, obstacle or edge in its way.
+
+        Args:
+            steps (int): Number of measures to move forwards
+
+        Returns:
+            int: Number of measures actually moved
+        """
+        moved = 0
+        while moved < steps and self.move():
+            moved += 1
+        return moved
+
+
+METRICS.register(WorldRobot, 'world', 'place', 'move', 'advance')
@@ -0,0 +1,41 @@
+"""Lazy WSGI entry point for toyrobot, serve with any WSGI server such as
+'gunicorn wsgi:application'.
+
+Importing this module only imports the standard library, so a server process
+is ready to accept connections straight away. Flask, dotenv and the routes in
+app.py are imported when the web app starts handling its first request.
+"""
+
+import sys
+
+_APP = []
+'''The Flask app once it has been imported'''
+
+
+def load():
+    """Import the Flask app, the first call loads Flask and dotenv.
+
+    Returns:
+        flask.Flask: The web app
+    """
+    if not _APP:
+        from app import app  # pylint: disable=import-outside-toplevel
+        _APP.append(app)
+    return _APP[0]
+
+
+def application(environ: dict, start_response):
+    """WSGI callable loading the web app on the first request.
+
+    Args:
+        environ (dict): WSGI environment of the request
+        start_response (Callable): WSGI callable starting the response
+
+    Returns:
+        Iterable[bytes]: The response body
+    """
+    return load()(environ, start_response)
+
+
+if __name__ == '__main__':
+    load().run(port=int(sys.argv[1]) if len(sys.argv) > 1 else 5000)